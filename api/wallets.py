@@ -1,8 +1,13 @@
 from http.server import BaseHTTPRequestHandler
 import json
+import os
+import sys
 import time
 from datetime import datetime
-from polymarket_apis.clients import PolymarketDataClient
+
+# Shared helpers live at the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from client_pool import get_data_client_pool
 
 # Hardcoded wallet addresses (from config.json)
 WALLET_ADDRESSES = [
@@ -23,18 +28,18 @@ WALLET_ADDRESSES = [
 def fetch_wallet_stats(funder_address):
     """Fetch wallet statistics using polymarket-apis"""
     try:
-        data_client = PolymarketDataClient()
-
-        # Get user metrics (includes P&L)
-        user_metric = data_client.get_user_metric(funder_address)
-        total_pnl = user_metric.amount
+        # Pooled client survives across warm invocations of this function
+        with get_data_client_pool().client() as data_client:
+            # Get user metrics (includes P&L)
+            user_metric = data_client.get_user_metric(funder_address)
+            total_pnl = user_metric.amount
 
-        # Get total markets traded
-        markets_traded = data_client.get_total_markets_traded(funder_address)
+            # Get total markets traded
+            markets_traded = data_client.get_total_markets_traded(funder_address)
 
-        # Get total volume from leaderboard
-        leaderboard_data = data_client.get_leaderboard_user_rank(funder_address)
-        total_volume = leaderboard_data.amount
+            # Get total volume from leaderboard
+            leaderboard_data = data_client.get_leaderboard_user_rank(funder_address)
+            total_volume = leaderboard_data.amount
 
         status = 'Active' if markets_traded > 0 else 'Inactive'
 
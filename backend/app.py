@@ -4,23 +4,53 @@ Polymarket Trading Bot Dashboard - Backend API
 FastAPI application for managing bot users and displaying statistics
 """
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-from typing import List, Dict, Optional, Any
+from fastapi.responses import HTMLResponse, Response
+from pydantic import BaseModel, ValidationError
+from typing import List, Dict, Optional, Any, Awaitable, Callable
 from datetime import datetime, timedelta
 import json
-import asyncio
-import aioredis
 import sqlite3
 import hashlib
 import secrets
 import os
+import time
 from contextlib import asynccontextmanager
 
+import db
+from db import run_db, init_db
+from pubsub import create_bridge
+from realtime import ConnectionManager, user_topic, wallet_topic
+from response_cache import RECENT_TRADES, STATS, WALLETS, create_cache
+from volume_history import VolumeHistory
+
+# Protocol-level WebSocket keepalive handled by uvicorn (seconds)
+WS_PING_INTERVAL = float(os.getenv('WS_PING_INTERVAL', 20))
+WS_PING_TIMEOUT = float(os.getenv('WS_PING_TIMEOUT', 20))
+
+PONG_MESSAGE = json.dumps({'type': 'pong'})
+
+# Largest number of trades accepted by one /api/trades/batch request
+MAX_TRADE_BATCH = int(os.getenv('MAX_TRADE_BATCH', 1000))
+
+# Largest /api/trades/batch body, so an oversized batch is refused before it is decoded
+MAX_TRADE_BATCH_BYTES = int(os.getenv('MAX_TRADE_BATCH_BYTES', MAX_TRADE_BATCH * 4096))
+
+TRADE_BATCH_TOO_LARGE = f"At most {MAX_TRADE_BATCH} trades per batch"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the cross-worker pub/sub listener for the lifetime of the worker"""
+    if bridge is not None:
+        await bridge.start()
+    yield
+    if bridge is not None:
+        await bridge.stop()
+    await response_cache.close()
+
 # Initialize FastAPI app
-app = FastAPI(title="Polymarket Bot Dashboard API", version="1.0.0")
+app = FastAPI(title="Polymarket Bot Dashboard API", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware for frontend
 app.add_middleware(
@@ -32,120 +62,76 @@ app.add_middleware(
 )
 
 # WebSocket connection manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
-
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
-
 manager = ConnectionManager()
+volume_history = VolumeHistory()
 
-# Database initialization
-def init_db():
-    """Initialize SQLite database with required tables"""
-    conn = sqlite3.connect('dashboard.db')
-    cursor = conn.cursor()
-
-    # Users table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id TEXT UNIQUE NOT NULL,
-        telegram_user_id INTEGER,
-        telegram_username TEXT,
-        api_key_hash TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        last_active TIMESTAMP,
-        is_active BOOLEAN DEFAULT 1,
-        settings TEXT DEFAULT '{}'
-    )
-    ''')
-
-    # Wallets table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS wallets (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id TEXT NOT NULL,
-        wallet_number INTEGER NOT NULL,
-        address TEXT NOT NULL,
-        funder_address TEXT,
-        position TEXT DEFAULT 'auto',
-        order_amount REAL DEFAULT 5.0,
-        max_daily_volume REAL DEFAULT 500.0,
-        auto_claim_enabled BOOLEAN DEFAULT 1,
-        is_active BOOLEAN DEFAULT 1,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (user_id) REFERENCES users (user_id),
-        UNIQUE(user_id, wallet_number)
-    )
-    ''')
-
-    # Trades table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS trades (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id TEXT NOT NULL,
-        wallet_id INTEGER NOT NULL,
-        market_id TEXT,
-        market_question TEXT,
-        side TEXT,
-        amount REAL,
-        price REAL,
-        status TEXT,
-        tx_hash TEXT,
-        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (user_id) REFERENCES users (user_id),
-        FOREIGN KEY (wallet_id) REFERENCES wallets (id)
-    )
-    ''')
-
-    # Statistics table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS statistics (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id TEXT NOT NULL,
-        date DATE NOT NULL,
-        total_volume REAL DEFAULT 0,
-        total_trades INTEGER DEFAULT 0,
-        winning_trades INTEGER DEFAULT 0,
-        profit_loss REAL DEFAULT 0,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (user_id) REFERENCES users (user_id),
-        UNIQUE(user_id, date)
-    )
-    ''')
-
-    # Pending registrations (temporary storage for Telegram bot)
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS pending_registrations (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id TEXT UNIQUE NOT NULL,
-        telegram_user_id INTEGER,
-        telegram_username TEXT,
-        verification_code TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        expires_at TIMESTAMP
-    )
-    ''')
+# Relays events between uvicorn workers through Redis (None without REDIS_URL)
+bridge = create_bridge(manager)
 
-    conn.commit()
-    conn.close()
+# Read-endpoint responses, in Redis when configured
+response_cache = create_cache()
 
 # Initialize database on startup
 init_db()
 
+# Rebuild the in-memory volume history from recent trades
+volume_history.load(db.load_volume_buckets(volume_history.resolution, volume_history.window))
+
+def add_volume(entries: List[List]):
+    """Record [user_id, amount, timestamp] entries in the volume history"""
+    for user_id, amount, timestamp in entries:
+        volume_history.add(user_id, amount, timestamp)
+
+if bridge is not None:
+    bridge.register('volume', add_volume)
+
+async def record_volume(trades: List[Dict]):
+    """Add new trades to this worker's volume history and share them with the others"""
+    now = time.time()
+    entries = [[trade['user_id'], trade['amount'], now] for trade in trades]
+    add_volume(entries)
+    if bridge is not None:
+        await bridge.send('volume', entries)
+
+def is_watched(topic: str) -> bool:
+    """Whether an event for `topic` may reach a client, here or on another worker"""
+    return bridge is not None or manager.has_subscribers(topic)
+
+async def cached_json(request: Request, endpoint: str, user_id: str,
+                      load: Callable[[], Awaitable[Any]], variant: str = '') -> Response:
+    """
+    Serve a read endpoint from the response cache
+
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
+
+    Args:
+        endpoint: Cache endpoint name, the unit of invalidation together with user_id
+        load: Produces the response data on a miss
+        variant: Distinguishes responses of one endpoint that differ by other parameters
+    """
+    entry, version = await response_cache.get(endpoint, user_id, variant)
+    if entry is None:
+        body = json.dumps(await load(), default=str, separators=(',', ':')).encode()
+        entry = await response_cache.set(endpoint, user_id, variant, version, body)
+
+    etag, body = entry
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if_none_match = request.headers.get('if-none-match', '')
+    if etag in (tag.strip() for tag in if_none_match.split(',')) or if_none_match.strip() == '*':
+        response_cache.not_modified()
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type='application/json', headers=headers)
+
+async def publish_event(topics: List[str], event: Dict, coalesce_key: Optional[str] = None):
+    """Serialize an event once and queue it for the subscribers of `topics` on every worker"""
+    if not any(is_watched(topic) for topic in topics):
+        return
+    message = json.dumps(event, default=str)
+    if any(manager.has_subscribers(topic) for topic in topics):
+        await manager.publish(topics, message, coalesce_key)
+    if bridge is not None:
+        await bridge.publish(topics, message, coalesce_key)
+
 # Pydantic models
 class UserRegistration(BaseModel):
     user_id: str
@@ -158,6 +144,30 @@ class WalletSettings(BaseModel):
     maxDailyVolume: float
     autoClaimEnabled: bool
 
+class BotStats(BaseModel):
+    timestamp: str
+    total_volume_24h: float = 0
+    total_trades_24h: int = 0
+    # Left out by bots that do not track settlements; stored as NULL
+    active_positions: Optional[int] = None
+    win_rate: Optional[float] = None
+    profit_loss_24h: Optional[float] = None
+
+class StatsUpdate(BaseModel):
+    user_id: str
+    stats: BotStats
+
+class WalletStatus(BaseModel):
+    wallet_number: int
+    address: Optional[str] = None
+    is_active: Optional[bool] = None
+    position: Optional[str] = None
+    order_amount: Optional[float] = None
+
+class WalletStatusBatch(BaseModel):
+    user_id: str
+    wallets: List[WalletStatus]
+
 class Trade(BaseModel):
     user_id: str
     wallet_id: int
@@ -168,103 +178,7 @@ class Trade(BaseModel):
     price: float
     status: str
     tx_hash: Optional[str]
-
-# Database helper functions
-def get_db_connection():
-    """Get database connection"""
-    conn = sqlite3.connect('dashboard.db')
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def get_user_stats(user_id: str, conn=None) -> Dict:
-    """Get user statistics"""
-    if conn is None:
-        conn = get_db_connection()
-        close_conn = True
-    else:
-        close_conn = False
-
-    cursor = conn.cursor()
-
-    # Get today's stats
-    today = datetime.now().date()
-    cursor.execute('''
-        SELECT * FROM statistics
-        WHERE user_id = ? AND date = ?
-    ''', (user_id, today))
-
-    stats = cursor.fetchone()
-
-    if close_conn:
-        conn.close()
-
-    if stats:
-        return dict(stats)
-    else:
-        return {
-            'totalVolume': 0,
-            'totalTrades': 0,
-            'winRate': 0,
-            'profitLoss': 0,
-            'activeWallets': 0,
-            'totalWallets': 12,
-            'volumeChange': 0,
-            'tradesPerHour': 0
-        }
-
-def get_user_wallets(user_id: str) -> List[Dict]:
-    """Get user wallets"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        SELECT w.*,
-               COUNT(t.id) as trades_count,
-               SUM(CASE WHEN t.timestamp > datetime('now', '-1 day') THEN t.amount ELSE 0 END) as volume_24h,
-               SUM(CASE WHEN t.status = 'filled' THEN t.amount * (t.price - 0.5) ELSE 0 END) as pnl
-        FROM wallets w
-        LEFT JOIN trades t ON w.id = t.wallet_id
-        WHERE w.user_id = ?
-        GROUP BY w.id
-        ORDER BY w.wallet_number
-    ''', (user_id,))
-
-    wallets = []
-    for row in cursor.fetchall():
-        wallet = dict(row)
-        wallet['status'] = 'active' if wallet['is_active'] else 'inactive'
-        wallet['number'] = wallet['wallet_number']
-        wallet['tradesCount'] = wallet['trades_count']
-        wallet['volume24h'] = wallet['volume_24h'] or 0
-        wallet['pnl'] = wallet['pnl'] or 0
-        wallets.append(wallet)
-
-    conn.close()
-    return wallets
-
-def get_recent_trades(user_id: str, limit: int = 20) -> List[Dict]:
-    """Get recent trades"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        SELECT t.*, w.wallet_number
-        FROM trades t
-        JOIN wallets w ON t.wallet_id = w.id
-        WHERE t.user_id = ?
-        ORDER BY t.timestamp DESC
-        LIMIT ?
-    ''', (user_id, limit))
-
-    trades = []
-    for row in cursor.fetchall():
-        trade = dict(row)
-        trade['walletNumber'] = trade['wallet_number']
-        trade['market'] = trade['market_question']
-        trades.append(trade)
-
-    conn.close()
-    return trades
+    idempotency_key: Optional[str] = None
 
 # API Endpoints
 
@@ -273,159 +187,229 @@ async def root():
     """Root endpoint"""
     return {"message": "Polymarket Trading Bot Dashboard API", "version": "1.0.0"}
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Real-time delivery counters"""
+    metrics = {"websocket": manager.metrics(), "cache": response_cache.metrics()}
+    if bridge is not None:
+        metrics["pubsub"] = bridge.metrics()
+    return metrics
+
 @app.get("/api/stats")
-async def get_stats(user_id: str = "default"):
+async def get_stats(request: Request, user_id: str = "default"):
     """Get dashboard statistics"""
-    stats = get_user_stats(user_id)
-
-    # Calculate additional metrics
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    # Active wallets count
-    cursor.execute('''
-        SELECT COUNT(*) as active_count
-        FROM wallets
-        WHERE user_id = ? AND is_active = 1
-    ''', (user_id,))
-    active_wallets = cursor.fetchone()['active_count']
-
-    # Volume history (last 24 hours)
-    cursor.execute('''
-        SELECT
-            strftime('%H', timestamp) as hour,
-            SUM(amount) as volume
-        FROM trades
-        WHERE user_id = ? AND timestamp > datetime('now', '-1 day')
-        GROUP BY hour
-        ORDER BY hour
-    ''', (user_id,))
-
-    volume_history = [0] * 24
-    for row in cursor.fetchall():
-        hour = int(row['hour'])
-        volume_history[hour] = row['volume']
-
-    conn.close()
-
-    stats.update({
-        'activeWallets': active_wallets,
-        'volumeHistory': volume_history
-    })
-
-    return stats
+    async def load():
+        stats = await run_db(db.get_dashboard_stats, user_id)
+        stats['volumeHistory'] = volume_history.snapshot(user_id)
+        return stats
+
+    return await cached_json(request, STATS, user_id, load)
+
+@app.post("/api/stats/update")
+async def update_stats(update: StatsUpdate):
+    """Store the bot's rolling 24h statistics snapshot (called by bot)"""
+    await run_db(db.save_bot_stats, update.user_id, update.stats.dict())
+    await response_cache.invalidate(update.user_id, [STATS])
+    return {"status": "success"}
 
 @app.get("/api/wallets")
-async def get_wallets(user_id: str = "default"):
+async def get_wallets(request: Request, user_id: str = "default"):
     """Get all wallets for a user"""
-    wallets = get_user_wallets(user_id)
-    return wallets
+    return await cached_json(request, WALLETS, user_id, lambda: run_db(db.get_user_wallets, user_id))
 
 @app.get("/api/trades/recent")
-async def get_trades(user_id: str = "default", limit: int = 20):
+async def get_trades(request: Request, user_id: str = "default", limit: int = 20):
     """Get recent trades"""
-    trades = get_recent_trades(user_id, limit)
-    return trades
+    return await cached_json(request, RECENT_TRADES, user_id,
+                             lambda: run_db(db.get_recent_trades, user_id, limit),
+                             variant=f"limit={limit}")
 
 @app.post("/api/wallets/{wallet_id}/settings")
 async def update_wallet_settings(wallet_id: int, settings: WalletSettings):
     """Update wallet settings"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        UPDATE wallets
-        SET position = ?,
-            order_amount = ?,
-            max_daily_volume = ?,
-            auto_claim_enabled = ?
-        WHERE id = ?
-    ''', (
+    owner = await run_db(
+        db.update_wallet_settings,
+        wallet_id,
         settings.tradingPair,
         settings.orderAmount,
         settings.maxDailyVolume,
-        settings.autoClaimEnabled,
-        wallet_id
-    ))
-
-    conn.commit()
-    conn.close()
+        settings.autoClaimEnabled
+    )
 
-    # Broadcast update to WebSocket clients
-    await manager.broadcast(json.dumps({
-        'type': 'wallet_update',
-        'wallet_id': wallet_id,
-        'settings': settings.dict()
-    }))
+    # Notify the wallet owner's WebSocket clients
+    if owner is not None:
+        await response_cache.invalidate(owner, [WALLETS])
+        await publish_event([user_topic(owner), wallet_topic(wallet_id)], {
+            'type': 'wallet_update',
+            'wallet_id': wallet_id,
+            'settings': settings.dict()
+        }, coalesce_key=f"wallet_update:{wallet_id}")
 
     return {"status": "success"}
 
+@app.post("/api/wallets/status")
+async def update_wallet_statuses(batch: WalletStatusBatch):
+    """Update the state of many wallets in one request (called by bot)"""
+    if not batch.wallets:
+        return {"status": "success", "updated": 0}
+
+    updated = await run_db(db.update_wallet_statuses, batch.user_id, [w.dict() for w in batch.wallets])
+    if updated:
+        await response_cache.invalidate(batch.user_id, [WALLETS, STATS])
+
+    # One message with the refreshed wallet list, only if someone is watching
+    topic = user_topic(batch.user_id)
+    if is_watched(topic):
+        wallets = await run_db(db.get_user_wallets, batch.user_id)
+        await publish_event([topic], {
+            'type': 'wallets',
+            'user_id': batch.user_id,
+            'wallets': wallets
+        }, coalesce_key=f"wallets:{batch.user_id}")
+
+    return {"status": "success", "updated": updated}
+
 @app.get("/api/users/{user_id}/status")
 async def check_user_status(user_id: str):
     """Check user registration status"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
-    user = cursor.fetchone()
-
-    conn.close()
+    user = await run_db(db.get_user, user_id)
 
     if user:
-        return {"registered": True, "user": dict(user)}
+        return {"registered": True, "user": user}
     else:
         return {"registered": False}
 
 @app.post("/api/trades")
 async def add_trade(trade: Trade):
     """Add a new trade (called by bot)"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        INSERT INTO trades (user_id, wallet_id, market_id, market_question,
-                           side, amount, price, status, tx_hash)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        trade.user_id, trade.wallet_id, trade.market_id,
-        trade.market_question, trade.side, trade.amount,
-        trade.price, trade.status, trade.tx_hash
-    ))
-
-    trade_id = cursor.lastrowid
-    conn.commit()
-
-    # Update statistics
-    cursor.execute('''
-        INSERT OR REPLACE INTO statistics (user_id, date, total_volume, total_trades)
-        VALUES (
-            ?,
-            date('now'),
-            COALESCE((SELECT total_volume FROM statistics WHERE user_id = ? AND date = date('now')), 0) + ?,
-            COALESCE((SELECT total_trades FROM statistics WHERE user_id = ? AND date = date('now')), 0) + 1
-        )
-    ''', (trade.user_id, trade.user_id, trade.amount, trade.user_id))
-
-    conn.commit()
-    conn.close()
-
-    # Broadcast to WebSocket
-    await manager.broadcast(json.dumps({
-        'type': 'trade',
-        'trade': trade.dict()
-    }))
-
-    return {"status": "success", "trade_id": trade_id}
+    result = await run_db(db.insert_trades, [trade.dict()])
+
+    # A re-sent trade (same idempotency_key) is acknowledged without a second broadcast
+    if result.inserted:
+        await record_volume([trade.dict()])
+        await response_cache.invalidate(trade.user_id)
+
+        # Notify the user's and the wallet's WebSocket subscribers
+        await publish_event([user_topic(trade.user_id), wallet_topic(trade.wallet_id)], {
+            'type': 'trade',
+            'trade': trade.dict()
+        })
+
+    return {"status": "success", "trade_id": result.trade_ids[0]}
+
+async def read_trade_batch(request: Request) -> bytes:
+    """
+    Read a /api/trades/batch body of at most MAX_TRADE_BATCH_BYTES
+
+    Raises:
+        HTTPException(413) from the Content-Length header alone, or as soon
+        as a streamed body passes the limit
+    """
+    declared = request.headers.get('content-length', '')
+    if declared.isdigit() and int(declared) > MAX_TRADE_BATCH_BYTES:
+        raise HTTPException(status_code=413, detail=TRADE_BATCH_TOO_LARGE)
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_TRADE_BATCH_BYTES:
+            raise HTTPException(status_code=413, detail=TRADE_BATCH_TOO_LARGE)
+    return bytes(body)
+
+def parse_trade_batch(body: bytes, content_type: str) -> List[Trade]:
+    """
+    Parse a batch of trades from a JSON array or an NDJSON stream
+
+    NDJSON batches are counted by line before anything is decoded.
+
+    Raises:
+        HTTPException(400/413/422) on malformed, oversized or invalid batches
+    """
+    try:
+        if 'ndjson' in content_type:
+            lines = [line for line in body.splitlines() if line.strip()]
+            if len(lines) > MAX_TRADE_BATCH:
+                raise HTTPException(status_code=413, detail=TRADE_BATCH_TOO_LARGE)
+            items = [json.loads(line) for line in lines]
+        else:
+            items = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if len(items) > MAX_TRADE_BATCH:
+        raise HTTPException(status_code=413, detail=TRADE_BATCH_TOO_LARGE)
+
+    try:
+        return [Trade(**item) for item in items]
+    except (TypeError, ValidationError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@app.post("/api/trades/batch")
+async def add_trades(request: Request):
+    """Add many trades in one transaction (JSON array or application/x-ndjson)"""
+    trades = parse_trade_batch(await read_trade_batch(request), request.headers.get('content-type', ''))
+    if not trades:
+        return {"status": "success", "trade_ids": [], "duplicates": 0}
+
+    result = await run_db(db.insert_trades, [trade.dict() for trade in trades])
+
+    if result.inserted:
+        await record_volume(result.inserted)
+
+    # One coalesced message per user, plus one per watched wallet
+    by_user: Dict[str, List[Dict]] = {}
+    for trade in result.inserted:
+        by_user.setdefault(trade['user_id'], []).append(trade)
+
+    for user_id, user_trades in by_user.items():
+        await response_cache.invalidate(user_id)
+        await publish_event([user_topic(user_id)], {'type': 'trades', 'trades': user_trades})
+
+        by_wallet: Dict[int, List[Dict]] = {}
+        for trade in user_trades:
+            by_wallet.setdefault(trade['wallet_id'], []).append(trade)
+        for wallet_id, wallet_trades in by_wallet.items():
+            await publish_event([wallet_topic(wallet_id)], {'type': 'trades', 'trades': wallet_trades})
+
+    return {
+        "status": "success",
+        "trade_ids": result.trade_ids,
+        "duplicates": len(trades) - len(result.inserted)
+    }
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time updates"""
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, user_id: str = "default",
+                             wallet: Optional[List[int]] = Query(None)):
+    """
+    WebSocket endpoint for real-time updates
+
+    Clients subscribe with ?user_id=... for every update of that user, or
+    narrow it with one or more ?wallet=<wallet id> to those wallets only.
+    Any client message counts as activity; {"type": "ping"} is answered
+    with {"type": "pong"}. Dead peers are detected by uvicorn's protocol
+    pings and idle clients by the manager's reaper.
+    """
+    topics = [wallet_topic(w) for w in wallet] if wallet else [user_topic(user_id)]
+    await manager.connect(websocket, topics)
     try:
+        # Event-driven: wake only when the client sends something
         while True:
-            # Keep connection alive
-            await asyncio.sleep(1)
-    except WebSocketDisconnect:
+            message = await websocket.receive_text()
+            manager.touch(websocket)
+
+            # Application-level heartbeat for browsers, which cannot send protocol pings
+            try:
+                is_ping = json.loads(message).get('type') == 'ping'
+            except (ValueError, AttributeError):
+                is_ping = False
+            if is_ping:
+                await manager.send_personal_message(PONG_MESSAGE, websocket)
+    except (WebSocketDisconnect, RuntimeError):
+        # RuntimeError: the socket was already closed by eviction
+        pass
+    finally:
         manager.disconnect(websocket)
 
 # Telegram Bot integration endpoints
@@ -433,49 +417,22 @@ async def websocket_endpoint(websocket: WebSocket):
 @app.post("/api/telegram/register")
 async def telegram_register(user_id: str, telegram_user_id: int, telegram_username: str):
     """Register user from Telegram bot"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     try:
-        # Create user
-        cursor.execute('''
-            INSERT INTO users (user_id, telegram_user_id, telegram_username, last_active)
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (user_id, telegram_user_id, telegram_username))
-
-        # Create default wallets (12 wallets, 6 pairs)
-        for i in range(1, 13):
-            cursor.execute('''
-                INSERT INTO wallets (user_id, wallet_number, address, position)
-                VALUES (?, ?, ?, ?)
-            ''', (user_id, i, f"0x{'0'*40}", "auto"))
-
-        conn.commit()
-        conn.close()
-
+        await run_db(db.register_telegram_user, user_id, telegram_user_id, telegram_username)
+        await response_cache.invalidate(user_id)
         return {"status": "success", "message": "User registered successfully"}
     except sqlite3.IntegrityError:
-        conn.close()
         raise HTTPException(status_code=400, detail="User already exists")
 
 @app.post("/api/telegram/update-credentials")
 async def update_credentials(user_id: str, api_key_hash: str):
     """Update user credentials (hashed)"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        UPDATE users
-        SET api_key_hash = ?, last_active = CURRENT_TIMESTAMP
-        WHERE user_id = ?
-    ''', (api_key_hash, user_id))
-
-    conn.commit()
-    conn.close()
+    await run_db(db.update_credentials, user_id, api_key_hash)
 
     return {"status": "success"}
 
 # Run the app
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=5000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=5000,
+                ws_ping_interval=WS_PING_INTERVAL, ws_ping_timeout=WS_PING_TIMEOUT)
\ No newline at end of file
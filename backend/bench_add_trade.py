@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark and concurrency check for trade ingestion
+Compares the throughput of the old two-commit INSERT OR REPLACE path with the
+single-transaction upsert in db.insert_trade, and checks that parallel writers
+lose no statistics updates against a read-modify-write control that does
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict
+
+# Point the data layer at a scratch database before importing it
+os.environ['DASHBOARD_DB_PATH'] = os.path.join(tempfile.mkdtemp(), 'bench_dashboard.db')
+
+import db  # noqa: E402
+
+WRITERS = 8
+TRADES_PER_WRITER = 500
+
+
+def make_trade(user_id: str, wallet_id: int, amount: float) -> Dict:
+    return {
+        'user_id': user_id,
+        'wallet_id': wallet_id,
+        'market_id': 'bench-market',
+        'market_question': 'Will the benchmark finish?',
+        'side': 'UP',
+        'amount': amount,
+        'price': 0.55,
+        'status': 'filled',
+        'tx_hash': None
+    }
+
+
+def legacy_insert_trade(trade: Dict) -> int:
+    """The insert path used before the single-transaction upsert"""
+    with db.db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO trades (user_id, wallet_id, market_id, market_question,
+                               side, amount, price, status, tx_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            trade['user_id'], trade['wallet_id'], trade['market_id'],
+            trade['market_question'], trade['side'], trade['amount'],
+            trade['price'], trade['status'], trade['tx_hash']
+        ))
+        trade_id = cursor.lastrowid
+        db._update_wallet_rollups(cursor, trade_id, trade_id, [trade])
+        conn.commit()
+
+        cursor.execute('''
+            INSERT OR REPLACE INTO statistics (user_id, date, total_volume, total_trades)
+            VALUES (
+                ?,
+                date('now'),
+                COALESCE((SELECT total_volume FROM statistics WHERE user_id = ? AND date = date('now')), 0) + ?,
+                COALESCE((SELECT total_trades FROM statistics WHERE user_id = ? AND date = date('now')), 0) + 1
+            )
+        ''', (trade['user_id'], trade['user_id'], trade['amount'], trade['user_id']))
+        conn.commit()
+    return trade_id
+
+
+def racy_insert_trade(trade: Dict) -> int:
+    """
+    Control path: statistics read and written back by separate statements
+
+    Concurrent writers overwrite each other's totals, so this must show lost
+    updates; if it does not, the check cannot detect them either.
+    """
+    with db.db_connection() as conn:
+        cursor = conn.execute('''
+            INSERT INTO trades (user_id, wallet_id, market_id, market_question,
+                               side, amount, price, status, tx_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            trade['user_id'], trade['wallet_id'], trade['market_id'],
+            trade['market_question'], trade['side'], trade['amount'],
+            trade['price'], trade['status'], trade['tx_hash']
+        ))
+        trade_id = cursor.lastrowid
+        conn.commit()
+
+        row = conn.execute(
+            "SELECT total_volume, total_trades FROM statistics WHERE user_id = ? AND date = date('now')",
+            (trade['user_id'],)
+        ).fetchone()
+        volume, count = (row['total_volume'], row['total_trades']) if row else (0, 0)
+
+        conn.execute('''
+            INSERT OR REPLACE INTO statistics (user_id, date, total_volume, total_trades)
+            VALUES (?, date('now'), ?, ?)
+        ''', (trade['user_id'], volume + trade['amount'], count + 1))
+        conn.commit()
+    return trade_id
+
+
+def run_writers(insert: Callable[[Dict], int], user_id: str) -> float:
+    """Hammer `insert` from WRITERS threads; returns elapsed seconds"""
+    barrier = threading.Barrier(WRITERS)
+    errors = []
+
+    def writer(n: int):
+        barrier.wait()
+        try:
+            for _ in range(TRADES_PER_WRITER):
+                insert(make_trade(user_id, n % 12 + 1, 1.0))
+        except sqlite3.Error as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(WRITERS)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    if errors:
+        print(f"  {len(errors)} writers failed: {errors[0]}")
+    return elapsed
+
+
+def today_stats(user_id: str) -> Dict:
+    with db.db_connection() as conn:
+        row = conn.execute(
+            "SELECT total_trades, total_volume FROM statistics WHERE user_id = ? AND date = date('now')",
+            (user_id,)
+        ).fetchone()
+        trades = conn.execute('SELECT COUNT(*) FROM trades WHERE user_id = ?', (user_id,)).fetchone()[0]
+    return {'total_trades': row['total_trades'], 'total_volume': row['total_volume'], 'rows': trades}
+
+
+if __name__ == '__main__':
+    db.init_db()
+    expected = WRITERS * TRADES_PER_WRITER
+    failed = False
+
+    print(f"📊 add_trade: {WRITERS} writers x {TRADES_PER_WRITER} trades\n")
+    print(f"{'Path':>8} {'Trades/s':>10} {'Rows':>7} {'Counted':>8} {'Lost':>6}")
+    print("-" * 43)
+
+    # The legacy statement is atomic in SQLite, so it is compared on throughput only
+    lost = {}
+    for name, insert in (('legacy', legacy_insert_trade), ('rmw', racy_insert_trade),
+                         ('upsert', db.insert_trade)):
+        user_id = f'bench-{name}'
+        db.register_telegram_user(user_id, 0, name)
+        elapsed = run_writers(insert, user_id)
+        stats = today_stats(user_id)
+        lost[name] = stats['rows'] - stats['total_trades']
+        print(f"{name:>8} {stats['rows'] / elapsed:>10,.0f} {stats['rows']:>7} "
+              f"{stats['total_trades']:>8} {lost[name]:>6}")
+
+        if name == 'upsert' and not (stats['rows'] == stats['total_trades'] == expected
+                                     and stats['total_volume'] == float(expected)):
+            failed = True
+
+    print()
+    if lost['rmw'] == 0:
+        failed = True
+        print("❌ The read-modify-write control lost no updates, so the check cannot detect them")
+    elif failed:
+        print("❌ Lost statistics updates with the upsert path")
+    else:
+        print(f"✅ No lost updates with the upsert path (control lost {lost['rmw']})")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Cross-worker fan-out check for the Redis pub/sub bridge
+Runs two workers' ConnectionManagers side by side on one channel, against an
+in-process fake Redis (default) or a real server given with --redis-url
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+import pubsub
+from pubsub import PubSubBridge
+from realtime import ConnectionManager, user_topic, wallet_topic
+
+
+class FakePubSub:
+    """The subset of redis.asyncio.client.PubSub used by the bridge"""
+
+    def __init__(self, redis: 'FakeRedis'):
+        self.redis = redis
+        self.channels: Set[str] = set()
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, channel: str):
+        self.redis.raise_if_down()
+        self.channels.add(channel)
+        self.redis.subscribers[channel].add(self)
+        await self.queue.put({'type': 'subscribe', 'channel': channel, 'data': 1})
+
+    async def listen(self):
+        while True:
+            message = await self.queue.get()
+            if isinstance(message, Exception):
+                raise message
+            yield message
+
+    async def reset(self):
+        for channel in self.channels:
+            self.redis.subscribers[channel].discard(self)
+        self.channels.clear()
+
+
+class FakeRedis:
+    """In-process stand-in for a Redis server's pub/sub"""
+
+    def __init__(self):
+        self.subscribers: Dict[str, Set[FakePubSub]] = defaultdict(set)
+        self.down = False
+
+    def raise_if_down(self):
+        if self.down:
+            raise ConnectionError('fake redis is down')
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self)
+
+    async def publish(self, channel: str, data: str) -> int:
+        self.raise_if_down()
+        for sub in list(self.subscribers[channel]):
+            await sub.queue.put({'type': 'message', 'channel': channel, 'data': data})
+        return len(self.subscribers[channel])
+
+    def drop_connections(self):
+        """Simulate an outage: every listener's connection fails"""
+        self.down = True
+        for subs in self.subscribers.values():
+            for sub in list(subs):
+                sub.queue.put_nowait(ConnectionError('connection lost'))
+
+    async def aclose(self):
+        pass
+
+
+class FakeSocket:
+    """Records what a WebSocket client would receive"""
+
+    def __init__(self):
+        self.received: List[Dict] = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        self.received.append(json.loads(message))
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+class Worker:
+    """One uvicorn worker's real-time state, publishing like app.publish_event"""
+
+    def __init__(self, redis):
+        self.manager = ConnectionManager()
+        self.bridge = PubSubBridge(redis, self.manager)
+        self.volume: List[List] = []
+        self.bridge.register('volume', self.volume.extend)
+
+    async def client(self, *topics: str) -> FakeSocket:
+        socket = FakeSocket()
+        await self.manager.connect(socket, topics)
+        return socket
+
+    async def publish(self, topics: List[str], event: Dict, coalesce_key: Optional[str] = None) -> bool:
+        message = json.dumps(event)
+        if any(self.manager.has_subscribers(t) for t in topics):
+            await self.manager.publish(topics, message, coalesce_key)
+        return await self.bridge.publish(topics, message, coalesce_key)
+
+
+async def settle():
+    """Let listeners relay and writer tasks drain"""
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+
+
+async def run(redis) -> int:
+    failures = 0
+
+    def check(name: str, ok: bool):
+        nonlocal failures
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {name}")
+
+    a, b = Worker(redis), Worker(redis)
+    for worker in (a, b):
+        await worker.bridge.start()
+        await worker.bridge.wait_subscribed(timeout=5)
+
+    a_user = await a.client(user_topic('u1'))
+    b_user = await b.client(user_topic('u1'))
+    b_wallet = await b.client(wallet_topic(7))
+    b_other = await b.client(user_topic('u2'))
+
+    await a.publish([user_topic('u1'), wallet_topic(7)], {'type': 'trade', 'n': 1})
+    await settle()
+    check("local client gets the event once", [m['n'] for m in a_user.received] == [1])
+    check("other worker's user client gets it once", [m['n'] for m in b_user.received] == [1])
+    check("other worker's wallet client gets it once", [m['n'] for m in b_wallet.received] == [1])
+    check("unrelated user's client gets nothing", b_other.received == [])
+    check("publisher skips its own echo", a.bridge.stats['own_skipped'] == 1)
+
+    await b.bridge.send('volume', [['u1', 5.0, 1700000000]])
+    await settle()
+    check("volume entries reach the other worker only", a.volume == [['u1', 5.0, 1700000000]] and b.volume == [])
+
+    def failing_handler(data):
+        raise ValueError('handler failed')
+
+    b.bridge.register('broken', failing_handler)
+    await redis.publish(pubsub.PUBSUB_CHANNEL, json.dumps({'origin': 'other', 'kind': 'publish', 'data': {}}))
+    await a.bridge.send('broken', {})
+    await a.publish([user_topic('u1')], {'type': 'trade', 'n': 2})
+    await settle()
+    check("bad payloads and failing handlers are counted as invalid",
+          b.bridge.stats['invalid'] == 2 and b.bridge.stats['resubscribes'] == 0)
+    check("the listener keeps relaying after them", [m['n'] for m in b_user.received] == [1, 2])
+
+    if isinstance(redis, FakeRedis):
+        redis.drop_connections()
+        delivered = await a.publish([user_topic('u1')], {'type': 'trade', 'n': 3})
+        await settle()
+        check("outage: local delivery continues", [m['n'] for m in a_user.received] == [1, 2, 3])
+        check("outage: failed publish is reported", not delivered and a.bridge.stats['publish_errors'] == 1)
+
+        redis.down = False
+        for worker in (a, b):
+            await worker.bridge.wait_subscribed(timeout=5)
+        await a.publish([user_topic('u1')], {'type': 'trade', 'n': 4})
+        await settle()
+        check("listeners resubscribe after the outage", [m['n'] for m in b_user.received] == [1, 2, 4])
+
+    for worker in (a, b):
+        await worker.bridge.stop()
+
+    print(f"\n{'All pub/sub checks passed' if not failures else f'{failures} pub/sub checks failed'}")
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--redis-url', help='check against a real Redis instead of the in-process fake')
+    args = parser.parse_args()
+
+    if args.redis_url:
+        if pubsub.aioredis is None:
+            print("❌ No Redis client installed (redis or aioredis)")
+            return 1
+        redis = pubsub.aioredis.from_url(args.redis_url, decode_responses=True)
+        print(f"🔁 Checking fan-out through {args.redis_url}\n")
+    else:
+        redis = FakeRedis()
+        print("🔁 Checking fan-out through an in-process fake Redis\n")
+
+    return asyncio.run(run(redis))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
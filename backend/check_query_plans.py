@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Query plan regression check for dashboard.db
+Migrates a scratch database and fails if any hot query falls back to a table SCAN
+"""
+
+import sqlite3
+import sys
+from typing import List
+
+from db import HOT_QUERIES
+from migrations import migrate
+
+
+def scans(conn: sqlite3.Connection, sql: str, params: tuple) -> List[str]:
+    """SCAN steps in a query's plan (index SEARCHes and temp b-trees are fine)"""
+    plan = conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+    return [row[3] for row in plan if row[3].startswith('SCAN')]
+
+
+def main() -> int:
+    conn = sqlite3.connect(':memory:')
+    version = migrate(conn)
+    print(f"🔍 Checking {len(HOT_QUERIES)} hot queries against schema v{version}\n")
+
+    failures = 0
+    for name, sql, params in HOT_QUERIES:
+        found = scans(conn, sql, params)
+        if found:
+            failures += 1
+            print(f"❌ {name}: {'; '.join(found)}")
+        else:
+            print(f"✅ {name}")
+
+    conn.close()
+    print(f"\n{'All query plans use indexes' if not failures else f'{failures} queries scan a table'}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Response cache check for the read endpoints
+Exercises hits, ETag/304 revalidation and per-user invalidation through the
+API on a scratch database, then the Redis store and its in-process fallback
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from typing import Dict, Optional
+
+# Point the app at a scratch database and keep it on the in-process cache
+os.environ['DASHBOARD_DB_PATH'] = os.path.join(tempfile.mkdtemp(), 'cache_check.db')
+os.environ.pop('REDIS_URL', None)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app as api  # noqa: E402
+from response_cache import STATS, WALLETS, ResponseCache  # noqa: E402
+
+failures = 0
+
+
+def check(name: str, ok: bool):
+    global failures
+    failures += not ok
+    print(f"{'✅' if ok else '❌'} {name}")
+
+
+def make_trade(user_id: str, wallet_id: int) -> Dict:
+    return {
+        'user_id': user_id, 'wallet_id': wallet_id, 'market_id': 'check-market',
+        'market_question': 'Will the cache stay fresh?', 'side': 'UP',
+        'amount': 5.0, 'price': 0.5, 'status': 'filled', 'tx_hash': None
+    }
+
+
+def check_endpoints():
+    client = TestClient(api.app)
+    for user_id in ('alice', 'bob'):
+        client.post('/api/telegram/register',
+                    params={'user_id': user_id, 'telegram_user_id': 1, 'telegram_username': user_id})
+
+    def get(path: str, user_id: str, etag: Optional[str] = None):
+        headers = {'If-None-Match': etag} if etag else {}
+        return client.get(path, params={'user_id': user_id}, headers=headers)
+
+    def endpoint_hits(endpoint: str) -> int:
+        return api.response_cache.stats[endpoint]['hits']
+
+    first = get('/api/wallets', 'alice')
+    hits = endpoint_hits(WALLETS)
+    second = get('/api/wallets', 'alice')
+    check("second read is a cache hit with the same body",
+          endpoint_hits(WALLETS) == hits + 1 and second.content == first.content)
+
+    etag = first.headers['etag']
+    revalidated = get('/api/wallets', 'alice', etag)
+    check("matching If-None-Match gets 304 without a body",
+          revalidated.status_code == 304 and revalidated.content == b'' and revalidated.headers['etag'] == etag)
+
+    stats_etags = {user_id: get('/api/stats', user_id).headers['etag'] for user_id in ('alice', 'bob')}
+    trades_etag = get('/api/trades/recent', 'alice').headers['etag']
+
+    client.post('/api/wallets/1/settings', json={
+        'tradingPair': 'DOWN', 'orderAmount': 9, 'maxDailyVolume': 90, 'autoClaimEnabled': False
+    })
+    settings = get('/api/wallets', 'alice', etag)
+    check("wallet settings invalidate the owner's wallets",
+          settings.status_code == 200 and any(w['order_amount'] == 9 for w in settings.json()))
+    check("wallet settings leave recent trades cached",
+          get('/api/trades/recent', 'alice', trades_etag).status_code == 304)
+
+    client.post('/api/trades', json=make_trade('alice', 1))
+    trades = get('/api/trades/recent', 'alice', trades_etag)
+    check("a new trade invalidates recent trades", trades.status_code == 200 and len(trades.json()) == 1)
+    check("a new trade invalidates the trader's stats",
+          get('/api/stats', 'alice', stats_etags['alice']).status_code == 200)
+    check("another user's stats stay cached",
+          get('/api/stats', 'bob', stats_etags['bob']).status_code == 304)
+
+    metrics = client.get('/api/metrics').json()['cache']
+    print(f"\n   backend={metrics['backend']} hits={metrics['hits']} misses={metrics['misses']} "
+          f"hit_ratio={metrics['hit_ratio']} not_modified={metrics['not_modified']}\n")
+    check("metrics report per-endpoint hit ratios",
+          all(metrics['endpoints'][e]['hit_ratio'] is not None for e in metrics['endpoints']))
+
+
+class FakeRedis:
+    """The string commands used by RedisStore, on a dict"""
+
+    def __init__(self):
+        self.data: Dict[str, str] = {}
+        self.down = False
+
+    async def get(self, key: str) -> Optional[str]:
+        if self.down:
+            raise ConnectionError('fake redis is down')
+        return self.data.get(key)
+
+    async def set(self, key: str, value: str, ex: int = None):
+        if self.down:
+            raise ConnectionError('fake redis is down')
+        self.data[key] = value
+
+    async def incr(self, key: str) -> int:
+        if self.down:
+            raise ConnectionError('fake redis is down')
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+async def check_redis_store():
+    redis = FakeRedis()
+    worker_a, worker_b = ResponseCache(redis), ResponseCache(redis)
+
+    entry, version = await worker_a.get(STATS, 'alice')
+    await worker_a.set(STATS, 'alice', '', version, b'{"v":1}')
+    entry, _ = await worker_b.get(STATS, 'alice')
+    check("entries are shared between workers through Redis", entry is not None and entry[1] == b'{"v":1}')
+
+    # A read that started before a write must not store its result for later readers
+    _, stale_version = await worker_b.get(WALLETS, 'alice')
+    await worker_a.invalidate('alice', [WALLETS])
+    await worker_b.set(WALLETS, 'alice', '', stale_version, b'[]')
+    entry, _ = await worker_a.get(WALLETS, 'alice')
+    check("invalidation on one worker wins over a racing read on another", entry is None)
+
+    redis.down = True
+    entry, version = await worker_a.get(STATS, 'alice')
+    await worker_a.set(STATS, 'alice', '', version, b'{"v":2}')
+    entry, _ = await worker_a.get(STATS, 'alice')
+    check("a Redis outage falls back to the in-process store",
+          entry is not None and entry[1] == b'{"v":2}' and worker_a.backend == 'memory'
+          and worker_a.counters['errors'] == 1)
+
+
+def main() -> int:
+    print("🗄️  Checking the response cache\n")
+    check_endpoints()
+    asyncio.run(check_redis_store())
+    print(f"\n{'All cache checks passed' if not failures else f'{failures} cache checks failed'}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
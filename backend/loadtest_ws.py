@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+WebSocket idle-connection load test
+Starts the dashboard API in a subprocess, holds N idle /ws connections open and
+samples the server's CPU time; idle clients should cost (almost) nothing
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+import websockets
+
+CLK_TCK = os.sysconf('SC_CLK_TCK')
+
+
+def raise_fd_limit(needed: int) -> int:
+    """Raise RLIMIT_NOFILE towards `needed`; the server subprocess inherits it"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+    if soft < target:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def cpu_seconds(pid: int) -> float:
+    """User + system CPU time of a process, from /proc/<pid>/stat"""
+    with open(f'/proc/{pid}/stat') as f:
+        # Fields after the parenthesised command name; utime and stime are 14 and 15
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLK_TCK
+
+
+def start_server(port: int) -> subprocess.Popen:
+    env = dict(os.environ, DASHBOARD_DB_PATH=os.path.join(tempfile.mkdtemp(), 'loadtest.db'))
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app:app', '--host', '127.0.0.1', '--port', str(port),
+         '--log-level', 'warning', '--ws-ping-interval', '20', '--ws-ping-timeout', '20'],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env
+    )
+
+
+async def wait_for_server(url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with websockets.connect(url):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def open_connections(url: str, count: int, batch: int) -> List:
+    """Open `count` idle clients, `batch` at a time; client-side pings are off"""
+    clients = []
+    for start in range(0, count, batch):
+        size = min(batch, count - start)
+        clients += await asyncio.gather(*(
+            websockets.connect(f'{url}?user_id=load-{start + i}', ping_interval=None, open_timeout=60)
+            for i in range(size)
+        ))
+        print(f"  {len(clients):>6} connected", end='\r', flush=True)
+    print()
+    return clients
+
+
+async def run(args) -> int:
+    url = f'ws://127.0.0.1:{args.port}/ws'
+    server = start_server(args.port)
+    try:
+        await wait_for_server(url)
+        started = time.perf_counter()
+        clients = await open_connections(url, args.connections, args.batch)
+        print(f"🔌 {len(clients)} idle connections in {time.perf_counter() - started:.1f}s")
+
+        # Let the accept burst settle before measuring
+        await asyncio.sleep(2)
+
+        print(f"\n{'Second':>6} {'CPU %':>7}")
+        print("-" * 14)
+        samples = []
+        last = cpu_seconds(server.pid)
+        for second in range(1, args.duration + 1):
+            await asyncio.sleep(1)
+            now = cpu_seconds(server.pid)
+            samples.append((now - last) * 100)
+            last = now
+            print(f"{second:>6} {samples[-1]:>7.1f}")
+
+        closed = sum(1 for ws in clients if ws.close_code is not None)
+        await asyncio.gather(*(ws.close() for ws in clients), return_exceptions=True)
+    finally:
+        server.terminate()
+        server.wait()
+
+    average = sum(samples) / len(samples)
+    print(f"\nServer CPU over {args.duration}s: avg {average:.1f}%, max {max(samples):.1f}%")
+    print(f"Connections closed by the server: {closed}")
+
+    failed = average > args.max_cpu or closed
+    print(f"{'❌' if failed else '✅'} {args.connections} idle connections "
+          f"{'exceed' if failed else 'stay within'} {args.max_cpu:.0f}% average CPU")
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--connections', type=int, default=10000)
+    parser.add_argument('--batch', type=int, default=500, help='connections opened concurrently')
+    parser.add_argument('--duration', type=int, default=30,
+                        help='seconds to sample (keep below WS_IDLE_TIMEOUT)')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--max-cpu', type=float, default=5.0, help='allowed average server CPU %%')
+    args = parser.parse_args()
+
+    limit = raise_fd_limit(args.connections + 1024)
+    if limit < args.connections + 64:
+        print(f"❌ Open file limit {limit} is too low for {args.connections} connections")
+        return 1
+
+    return asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Polymarket Trading Bot Dashboard - Schema migrations
+Versioned schema changes for dashboard.db, tracked in PRAGMA user_version
+"""
+
+import sqlite3
+from collections import namedtuple
+from typing import List
+
+# One schema step: SQL statements applied in order
+Migration = namedtuple('Migration', ['version', 'description', 'statements'])
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'initial schema', [
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT UNIQUE NOT NULL,
+            telegram_user_id INTEGER,
+            telegram_username TEXT,
+            api_key_hash TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_active TIMESTAMP,
+            is_active BOOLEAN DEFAULT 1,
+            settings TEXT DEFAULT '{}'
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS wallets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            wallet_number INTEGER NOT NULL,
+            address TEXT NOT NULL,
+            funder_address TEXT,
+            position TEXT DEFAULT 'auto',
+            order_amount REAL DEFAULT 5.0,
+            max_daily_volume REAL DEFAULT 500.0,
+            auto_claim_enabled BOOLEAN DEFAULT 1,
+            is_active BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (user_id),
+            UNIQUE(user_id, wallet_number)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS trades (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            wallet_id INTEGER NOT NULL,
+            market_id TEXT,
+            market_question TEXT,
+            side TEXT,
+            amount REAL,
+            price REAL,
+            status TEXT,
+            tx_hash TEXT,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (user_id),
+            FOREIGN KEY (wallet_id) REFERENCES wallets (id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS statistics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            date DATE NOT NULL,
+            total_volume REAL DEFAULT 0,
+            total_trades INTEGER DEFAULT 0,
+            winning_trades INTEGER DEFAULT 0,
+            profit_loss REAL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (user_id),
+            UNIQUE(user_id, date)
+        )
+        ''',
+        # Pending registrations (temporary storage for Telegram bot)
+        '''
+        CREATE TABLE IF NOT EXISTS pending_registrations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT UNIQUE NOT NULL,
+            telegram_user_id INTEGER,
+            telegram_username TEXT,
+            verification_code TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP
+        )
+        ''',
+    ]),
+
+    Migration(2, 'trade indexes for recent trades, 24h volume and wallet aggregates', [
+        # Recent trades (ORDER BY timestamp DESC) and the 24h volume range scan
+        '''
+        CREATE INDEX IF NOT EXISTS idx_trades_user_time
+            ON trades (user_id, timestamp, amount)
+        ''',
+        # Per-wallet join in get_user_wallets, covering every column it aggregates
+        '''
+        CREATE INDEX IF NOT EXISTS idx_trades_wallet_status
+            ON trades (wallet_id, status, timestamp, amount, price)
+        ''',
+    ]),
+
+    Migration(3, 'per-wallet rollups maintained on trade insert', [
+        # Lifetime trade count and PnL per wallet
+        '''
+        CREATE TABLE IF NOT EXISTS wallet_rollups (
+            wallet_id INTEGER PRIMARY KEY,
+            trades_count INTEGER NOT NULL DEFAULT 0,
+            pnl REAL NOT NULL DEFAULT 0,
+            FOREIGN KEY (wallet_id) REFERENCES wallets (id)
+        )
+        ''',
+        # Traded volume per wallet per UTC hour (unix time // 3600), last 24h only
+        '''
+        CREATE TABLE IF NOT EXISTS wallet_volume_hourly (
+            wallet_id INTEGER NOT NULL,
+            hour INTEGER NOT NULL,
+            volume REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (wallet_id, hour)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        INSERT OR REPLACE INTO wallet_rollups (wallet_id, trades_count, pnl)
+        SELECT wallet_id,
+               COUNT(*),
+               SUM(CASE WHEN status = 'filled' THEN amount * (price - 0.5) ELSE 0 END)
+        FROM trades
+        GROUP BY wallet_id
+        ''',
+        '''
+        INSERT OR REPLACE INTO wallet_volume_hourly (wallet_id, hour, volume)
+        SELECT wallet_id,
+               CAST(strftime('%s', timestamp) AS INTEGER) / 3600 AS hour,
+               SUM(amount)
+        FROM trades
+        WHERE timestamp > datetime('now', '-1 day')
+        GROUP BY wallet_id, hour
+        ''',
+    ]),
+
+    Migration(4, 'idempotency keys for re-sent trades', [
+        'ALTER TABLE trades ADD COLUMN idempotency_key TEXT',
+        '''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_trades_idempotency_key
+            ON trades (idempotency_key) WHERE idempotency_key IS NOT NULL
+        ''',
+    ]),
+
+    Migration(5, 'bot-reported rolling statistics', [
+        # Latest 24h snapshot computed by the bot, one row per user
+        '''
+        CREATE TABLE IF NOT EXISTS bot_stats (
+            user_id TEXT PRIMARY KEY,
+            reported_at TIMESTAMP,
+            total_volume_24h REAL DEFAULT 0,
+            total_trades_24h INTEGER DEFAULT 0,
+            active_positions INTEGER DEFAULT 0,
+            win_rate REAL DEFAULT 0,
+            profit_loss_24h REAL DEFAULT 0,
+            received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        )
+        ''',
+    ]),
+]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Current schema version of a database"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, migrations: List[Migration] = MIGRATIONS) -> int:
+    """
+    Apply every migration newer than the database's schema version
+
+    Runs in one IMMEDIATE transaction, so concurrent workers starting
+    together apply each step exactly once and a failed step leaves the
+    database at its previous version.
+
+    Args:
+        conn: Open database connection
+        migrations: Migrations in ascending version order
+
+    Returns:
+        The schema version after migrating
+    """
+    if conn.in_transaction:
+        conn.commit()
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        current = schema_version(conn)
+        for migration in migrations:
+            if migration.version <= current:
+                continue
+            for statement in migration.statements:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {migration.version}')
+            current = migration.version
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return current
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Polymarket Trading Bot Dashboard - Cross-worker fan-out
+Redis pub/sub bridge relaying real-time events between uvicorn workers
+"""
+
+import asyncio
+import json
+import os
+import uuid
+from typing import Any, Callable, Dict, Iterable, Optional
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:
+    try:
+        import aioredis
+    except ImportError:
+        aioredis = None
+
+from realtime import ConnectionManager
+
+# Unset disables the bridge: a single worker needs no Redis
+REDIS_URL = os.getenv('REDIS_URL')
+PUBSUB_CHANNEL = os.getenv('PUBSUB_CHANNEL', 'dashboard:events')
+
+# Seconds a request may wait on Redis before the remote copy of an event is dropped
+PUBSUB_PUBLISH_TIMEOUT = float(os.getenv('PUBSUB_PUBLISH_TIMEOUT', 1))
+
+# Backoff between attempts to re-subscribe after losing Redis
+PUBSUB_RETRY_BASE_DELAY = 0.5
+PUBSUB_RETRY_MAX_DELAY = 30
+
+
+class PubSubBridge:
+    """
+    Relays events published in one worker to the sockets of every other worker
+
+    Each worker delivers its own events to its local sockets directly and
+    publishes one envelope per event on a shared channel. The other workers
+    hand the envelope to their own ConnectionManager; the publishing worker
+    recognises its origin id and skips the echo, so no client sees an event
+    twice and local delivery keeps working while Redis is unavailable.
+
+    Besides WebSocket messages, envelopes can carry other kinds of
+    worker-local state changes to handlers registered with register().
+    """
+
+    def __init__(self, redis, manager: ConnectionManager, channel: str = PUBSUB_CHANNEL):
+        """
+        Args:
+            redis: Async Redis client (redis.asyncio or aioredis 2.x API)
+            manager: This worker's ConnectionManager
+            channel: Redis channel shared by all workers
+        """
+        self.redis = redis
+        self.manager = manager
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._handlers: Dict[str, Callable[[Any], None]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+        self.stats = {
+            'published': 0,
+            'publish_errors': 0,
+            'received': 0,
+            'relayed': 0,
+            'own_skipped': 0,
+            'invalid': 0,
+            'resubscribes': 0
+        }
+
+    def register(self, kind: str, handler: Callable[[Any], None]):
+        """Call `handler(data)` for envelopes of `kind` sent by other workers"""
+        self._handlers[kind] = handler
+
+    async def start(self):
+        self._listener = asyncio.create_task(self._listen())
+
+    async def wait_subscribed(self, timeout: Optional[float] = None):
+        """Wait until the listener has subscribed to the channel"""
+        await asyncio.wait_for(self._subscribed.wait(), timeout)
+
+    async def stop(self):
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        close = getattr(self.redis, 'aclose', None) or self.redis.close
+        await close()
+
+    async def publish(self, topics: Iterable[str], message: str, coalesce_key: Optional[str] = None) -> bool:
+        """Share an already serialized WebSocket message with the other workers"""
+        return await self.send('publish', {
+            'topics': list(topics),
+            'message': message,
+            'coalesce_key': coalesce_key
+        })
+
+    async def send(self, kind: str, data: Any) -> bool:
+        """
+        Publish an envelope to the other workers
+
+        Returns:
+            False if Redis could not take it; the local copy is unaffected
+        """
+        # While the listener is reconnecting Redis is likely down: do not make requests wait on it
+        if not self._subscribed.is_set():
+            self.stats['publish_errors'] += 1
+            return False
+
+        envelope = json.dumps({'origin': self.origin, 'kind': kind, 'data': data}, default=str)
+        try:
+            await asyncio.wait_for(self.redis.publish(self.channel, envelope), PUBSUB_PUBLISH_TIMEOUT)
+        except Exception:
+            self.stats['publish_errors'] += 1
+            return False
+        self.stats['published'] += 1
+        return True
+
+    async def _listen(self):
+        delay = PUBSUB_RETRY_BASE_DELAY
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message['type'] == 'subscribe':
+                        self._subscribed.set()
+                        delay = PUBSUB_RETRY_BASE_DELAY
+                    elif message['type'] == 'message':
+                        await self._dispatch(message['data'])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Lost Redis: events published meanwhile are not replayed
+                self._subscribed.clear()
+                self.stats['resubscribes'] += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, PUBSUB_RETRY_MAX_DELAY)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+
+    async def _dispatch(self, raw):
+        self.stats['received'] += 1
+        try:
+            envelope = json.loads(raw)
+            origin, kind, data = envelope['origin'], envelope['kind'], envelope['data']
+        except (ValueError, TypeError, KeyError):
+            self.stats['invalid'] += 1
+            return
+
+        if origin == self.origin:
+            self.stats['own_skipped'] += 1
+            return
+
+        # A bad payload or a failing handler costs this one message, never the subscription
+        try:
+            if kind == 'publish':
+                topics = [t for t in data['topics'] if self.manager.has_subscribers(t)]
+                if topics:
+                    await self.manager.publish(topics, data['message'], data.get('coalesce_key'))
+            else:
+                handler = self._handlers.get(kind)
+                if handler is None:
+                    self.stats['invalid'] += 1
+                    return
+                handler(data)
+        except Exception:
+            self.stats['invalid'] += 1
+            return
+        self.stats['relayed'] += 1
+
+    def metrics(self) -> Dict:
+        metrics = dict(self.stats)
+        metrics['subscribed'] = self._subscribed.is_set()
+        return metrics
+
+
+def create_bridge(manager: ConnectionManager, url: Optional[str] = REDIS_URL) -> Optional[PubSubBridge]:
+    """A bridge on `url`, or None when no Redis is configured or no client is installed"""
+    if not url or aioredis is None:
+        return None
+    redis = aioredis.from_url(url, decode_responses=True, socket_connect_timeout=PUBSUB_PUBLISH_TIMEOUT)
+    return PubSubBridge(redis, manager)
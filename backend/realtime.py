@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Polymarket Trading Bot Dashboard - Real-time delivery
+WebSocket connection manager with topic subscriptions and a bounded send
+queue and writer task per client
+"""
+
+import asyncio
+import os
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+from fastapi import WebSocket
+
+# Messages buffered per client before the oldest is dropped
+WS_SEND_QUEUE_SIZE = int(os.getenv('WS_SEND_QUEUE_SIZE', 256))
+
+# A client that cannot take one message within this many seconds is evicted
+WS_SEND_TIMEOUT = float(os.getenv('WS_SEND_TIMEOUT', 10))
+
+# A client that has sent nothing (not even a ping) for this long is evicted
+WS_IDLE_TIMEOUT = float(os.getenv('WS_IDLE_TIMEOUT', 90))
+
+# How often the single reaper task looks for idle clients
+WS_REAP_INTERVAL = float(os.getenv('WS_REAP_INTERVAL', 15))
+
+
+def user_topic(user_id: str) -> str:
+    """Topic carrying every update for one user"""
+    return f"user:{user_id}"
+
+
+def wallet_topic(wallet_id: int) -> str:
+    """Topic carrying updates for one wallet (by wallets.id)"""
+    return f"wallet:{wallet_id}"
+
+
+class ClientConnection:
+    """
+    One connected client: a bounded outgoing queue drained by its own writer task
+
+    When the queue is full the oldest message is dropped. Messages sent with
+    a coalesce key replace a still-queued message with the same key, so a
+    slow client gets the latest wallet list instead of every version of it.
+    """
+
+    def __init__(self, websocket: WebSocket, manager: 'ConnectionManager',
+                 max_queue: int = WS_SEND_QUEUE_SIZE):
+        self.websocket = websocket
+        self.manager = manager
+        self.max_queue = max_queue
+        self._queue = deque()  # [coalesce key, message] entries
+        self._keyed: Dict[str, list] = {}
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self.topics: Set[str] = set()
+        self.last_seen = asyncio.get_running_loop().time()
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write_loop())
+
+    def stop(self):
+        if self._writer and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, message: str, coalesce_key: Optional[str] = None):
+        """Queue a message without waiting for the client"""
+        if coalesce_key is not None:
+            entry = self._keyed.get(coalesce_key)
+            if entry is not None:
+                entry[1] = message
+                self.manager.stats['coalesced'] += 1
+                return
+
+        if len(self._queue) >= self.max_queue:
+            dropped_key, _ = self._queue.popleft()
+            if dropped_key is not None:
+                self._keyed.pop(dropped_key, None)
+            self.manager.stats['dropped'] += 1
+
+        entry = [coalesce_key, message]
+        self._queue.append(entry)
+        if coalesce_key is not None:
+            self._keyed[coalesce_key] = entry
+        self._ready.set()
+
+    async def _write_loop(self):
+        try:
+            while True:
+                if not self._queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+
+                key, message = self._queue.popleft()
+                if key is not None:
+                    self._keyed.pop(key, None)
+
+                await asyncio.wait_for(self.websocket.send_text(message), timeout=WS_SEND_TIMEOUT)
+                self.manager.stats['sent'] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Dead or stalled socket: stop delivering to it
+            self.manager.evict(self.websocket)
+
+
+class ConnectionManager:
+    """
+    Tracks connected WebSocket clients and fans messages out to them
+
+    Clients subscribe to topics when they connect; publish() looks the
+    subscribers up in a topic -> clients index, so each event is serialized
+    once by the caller and reaches only the clients that asked for it.
+    Sending only enqueues, so a request that triggers an update never waits
+    on WebSocket delivery, and one slow client cannot delay the rest.
+    """
+
+    def __init__(self, max_queue: int = WS_SEND_QUEUE_SIZE, idle_timeout: float = WS_IDLE_TIMEOUT,
+                 reap_interval: float = WS_REAP_INTERVAL):
+        self.max_queue = max_queue
+        self.idle_timeout = idle_timeout
+        self.reap_interval = reap_interval
+        self._reaper: Optional[asyncio.Task] = None
+        self.connections: Dict[WebSocket, ClientConnection] = {}
+        self.subscribers: Dict[str, Set[ClientConnection]] = {}
+        self.stats = {
+            'connected': 0,
+            'disconnected': 0,
+            'evicted': 0,
+            'idle_evicted': 0,
+            'broadcasts': 0,
+            'published': 0,
+            'unrouted': 0,
+            'sent': 0,
+            'dropped': 0,
+            'coalesced': 0
+        }
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.connections)
+
+    def is_connected(self, websocket: WebSocket) -> bool:
+        return websocket in self.connections
+
+    async def connect(self, websocket: WebSocket, topics: Iterable[str] = ()):
+        await websocket.accept()
+        client = ClientConnection(websocket, self, self.max_queue)
+        self.connections[websocket] = client
+        for topic in topics:
+            self.subscribe(websocket, topic)
+        client.start()
+        self.stats['connected'] += 1
+
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_loop())
+
+    def touch(self, websocket: WebSocket):
+        """Record activity from a client"""
+        client = self.connections.get(websocket)
+        if client:
+            client.last_seen = asyncio.get_running_loop().time()
+
+    async def _reap_loop(self):
+        """Evict clients idle for longer than idle_timeout; one task for all connections"""
+        while self.connections:
+            await asyncio.sleep(self.reap_interval)
+            cutoff = asyncio.get_running_loop().time() - self.idle_timeout
+            idle = [ws for ws, client in self.connections.items() if client.last_seen < cutoff]
+            for websocket in idle:
+                self.stats['idle_evicted'] += 1
+                self.evict(websocket)
+
+    def subscribe(self, websocket: WebSocket, topic: str):
+        client = self.connections.get(websocket)
+        if client:
+            client.topics.add(topic)
+            self.subscribers.setdefault(topic, set()).add(client)
+
+    def disconnect(self, websocket: WebSocket):
+        client = self.connections.pop(websocket, None)
+        if client:
+            for topic in client.topics:
+                subscribers = self.subscribers.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(client)
+                    if not subscribers:
+                        del self.subscribers[topic]
+            client.stop()
+            self.stats['disconnected'] += 1
+
+    def has_subscribers(self, topic: str) -> bool:
+        return topic in self.subscribers
+
+    def evict(self, websocket: WebSocket):
+        """Drop a client whose socket failed or stalled, and close it in the background"""
+        if websocket not in self.connections:
+            return
+        self.disconnect(websocket)
+        self.stats['evicted'] += 1
+        asyncio.create_task(self._close(websocket))
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(websocket.close(code=1011), timeout=1)
+        except Exception:
+            pass
+
+    async def send_personal_message(self, message: str, websocket: WebSocket):
+        client = self.connections.get(websocket)
+        if client:
+            client.enqueue(message)
+
+    async def broadcast(self, message: str, coalesce_key: Optional[str] = None):
+        """Queue a message for every connected client; returns without waiting for delivery"""
+        self.stats['broadcasts'] += 1
+        for client in list(self.connections.values()):
+            client.enqueue(message, coalesce_key)
+
+    async def publish(self, topics: Iterable[str], message: str, coalesce_key: Optional[str] = None):
+        """Queue a message for the subscribers of any of `topics`, each client at most once"""
+        recipients = set()
+        for topic in topics:
+            recipients.update(self.subscribers.get(topic, ()))
+
+        self.stats['published'] += 1
+        if not recipients:
+            self.stats['unrouted'] += 1
+        for client in recipients:
+            client.enqueue(message, coalesce_key)
+
+    def metrics(self) -> Dict:
+        depths = [client.depth for client in self.connections.values()]
+        metrics = dict(self.stats)
+        metrics.update({
+            'active': len(self.connections),
+            'topics': len(self.subscribers),
+            'queued': sum(depths),
+            'max_queue_depth': max(depths, default=0)
+        })
+        return metrics
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Polymarket Trading Bot Dashboard - Response cache
+Serialized read-endpoint responses per (endpoint, user_id) in Redis, with an
+in-process fallback, ETags and per-user invalidation on writes
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from pubsub import REDIS_URL, aioredis
+
+# Upper bound on staleness for changes no write invalidates (hour and day rollover)
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 60))
+
+# Entries kept by the in-process store
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 2048))
+
+# Seconds to serve from the in-process store after a Redis call fails
+RESPONSE_CACHE_RETRY_AFTER = float(os.getenv('RESPONSE_CACHE_RETRY_AFTER', 5))
+
+RESPONSE_CACHE_PREFIX = 'dashboard:cache'
+
+# Cached endpoints, as passed to ResponseCache.get()/set()/invalidate()
+STATS = 'stats'
+WALLETS = 'wallets'
+RECENT_TRADES = 'trades/recent'
+ENDPOINTS = (STATS, WALLETS, RECENT_TRADES)
+
+# (etag, body)
+CacheEntry = Tuple[str, bytes]
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+class MemoryStore:
+    """In-process store: a version counter per (endpoint, user_id) and LRU-bounded entries"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._versions: Dict[str, int] = {}
+        self._entries: OrderedDict = OrderedDict()  # key -> (value, expires_at)
+
+    async def version(self, scope: str) -> int:
+        return self._versions.get(scope, 0)
+
+    async def bump(self, scope: str):
+        self._versions[scope] = self._versions.get(scope, 0) + 1
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    async def set(self, key: str, value: str, ttl: int):
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class RedisStore:
+    """Store shared by all workers; version counters are plain Redis integers"""
+
+    name = 'redis'
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def version(self, scope: str) -> int:
+        return int(await self.redis.get(f'{RESPONSE_CACHE_PREFIX}:v:{scope}') or 0)
+
+    async def bump(self, scope: str):
+        await self.redis.incr(f'{RESPONSE_CACHE_PREFIX}:v:{scope}')
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.redis.get(f'{RESPONSE_CACHE_PREFIX}:{key}')
+
+    async def set(self, key: str, value: str, ttl: int):
+        await self.redis.set(f'{RESPONSE_CACHE_PREFIX}:{key}', value, ex=ttl)
+
+
+class ResponseCache:
+    """
+    Cache of serialized JSON responses, keyed by endpoint and user_id
+
+    Every (endpoint, user_id) pair has a version counter that is part of
+    the entry key. invalidate() bumps the counter instead of deleting
+    entries, so a request that loaded data before a write cannot store
+    it under the new version; superseded entries simply expire.
+
+    Redis is used when configured. If a Redis call fails, the in-process
+    store serves requests for the next RESPONSE_CACHE_RETRY_AFTER seconds,
+    so an outage neither fails nor slows reads. While it lasts, writes on
+    other workers are only seen after `ttl`.
+    """
+
+    def __init__(self, redis=None, ttl: int = RESPONSE_CACHE_TTL):
+        """
+        Args:
+            redis: Async Redis client (decode_responses=True), or None for in-process only
+            ttl: Seconds an entry lives without being invalidated
+        """
+        self.ttl = ttl
+        self.memory = MemoryStore()
+        self.redis = RedisStore(redis) if redis is not None else None
+        self._redis_retry_at = 0.0
+        self.stats = {endpoint: {'hits': 0, 'misses': 0} for endpoint in ENDPOINTS}
+        self.counters = {'not_modified': 0, 'invalidations': 0, 'errors': 0}
+
+    def _use_redis(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self):
+        self.counters['errors'] += 1
+        self._redis_retry_at = time.monotonic() + RESPONSE_CACHE_RETRY_AFTER
+
+    @property
+    def backend(self) -> str:
+        return self.redis.name if self._use_redis() else self.memory.name
+
+    async def _call(self, method: str, *args):
+        """Run a store operation on Redis, falling back to the in-process store"""
+        if self._use_redis():
+            try:
+                return await getattr(self.redis, method)(*args)
+            except Exception:
+                self._redis_failed()
+        return await getattr(self.memory, method)(*args)
+
+    async def get(self, endpoint: str, user_id: str, variant: str = '') -> Tuple[Optional[CacheEntry], int]:
+        """
+        Look up a cached response
+
+        Returns:
+            (entry or None, version); pass the version on to set() after a miss
+        """
+        scope = f'{endpoint}:{user_id}'
+        version = await self._call('version', scope)
+        value = await self._call('get', f'{scope}:{version}:{variant}')
+        if value is None:
+            self.stats[endpoint]['misses'] += 1
+            return None, version
+
+        self.stats[endpoint]['hits'] += 1
+        etag, body = value.split('\n', 1)
+        return (etag, body.encode()), version
+
+    async def set(self, endpoint: str, user_id: str, variant: str, version: int, body: bytes) -> CacheEntry:
+        """Store a freshly rendered response under the version get() returned"""
+        etag = make_etag(body)
+        await self._call('set', f'{endpoint}:{user_id}:{version}:{variant}', f'{etag}\n{body.decode()}', self.ttl)
+        return etag, body
+
+    async def invalidate(self, user_id: str, endpoints: Iterable[str] = ENDPOINTS):
+        """Drop `user_id`'s cached responses for `endpoints`"""
+        for endpoint in endpoints:
+            scope = f'{endpoint}:{user_id}'
+            # Bump both so a Redis outage cannot leave the fallback store stale
+            await self.memory.bump(scope)
+            if self._use_redis():
+                try:
+                    await self.redis.bump(scope)
+                except Exception:
+                    self._redis_failed()
+            self.counters['invalidations'] += 1
+
+    async def close(self):
+        if self.redis is not None:
+            close = getattr(self.redis.redis, 'aclose', None) or self.redis.redis.close
+            await close()
+
+    def not_modified(self):
+        self.counters['not_modified'] += 1
+
+    def metrics(self) -> Dict:
+        endpoints = {}
+        for endpoint, counts in self.stats.items():
+            lookups = counts['hits'] + counts['misses']
+            endpoints[endpoint] = dict(counts, hit_ratio=round(counts['hits'] / lookups, 3) if lookups else None)
+
+        hits = sum(c['hits'] for c in self.stats.values())
+        lookups = hits + sum(c['misses'] for c in self.stats.values())
+        metrics = {'backend': self.backend, 'hits': hits, 'misses': lookups - hits,
+                   'hit_ratio': round(hits / lookups, 3) if lookups else None, 'endpoints': endpoints}
+        metrics.update(self.counters)
+        return metrics
+
+
+def create_cache(url: Optional[str] = REDIS_URL) -> ResponseCache:
+    """A cache backed by Redis at `url`, or in-process only when Redis is not available"""
+    if not url or aioredis is None:
+        return ResponseCache()
+    return ResponseCache(aioredis.from_url(url, decode_responses=True, socket_connect_timeout=1))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Polymarket Trading Bot Dashboard - Volume history
+In-memory per-user ring buffer of traded volume feeding /api/stats volumeHistory
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Number of slots and seconds per slot (24 x 1h by default)
+VOLUME_HISTORY_SLOTS = int(os.getenv('VOLUME_HISTORY_SLOTS', 24))
+VOLUME_HISTORY_RESOLUTION = int(os.getenv('VOLUME_HISTORY_RESOLUTION', 3600))
+
+
+class VolumeHistory:
+    """
+    Fixed-size ring buffer of volume per time bucket, one per user
+
+    Slot i holds the most recent bucket with bucket % slots == i, so with
+    the default 24 x 1h layout slot i is UTC hour i, matching the
+    volumeHistory array the dashboard already renders. Each slot remembers
+    which bucket it holds, so stale slots read as zero without any sweep.
+    """
+
+    def __init__(self, slots: int = VOLUME_HISTORY_SLOTS,
+                 resolution: int = VOLUME_HISTORY_RESOLUTION):
+        self.slots = slots
+        self.resolution = resolution
+        self._volume: Dict[str, List[float]] = {}
+        self._buckets: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def window(self) -> int:
+        """Seconds of history covered by the buffer"""
+        return self.slots * self.resolution
+
+    def add(self, user_id: str, amount: float, timestamp: Optional[float] = None):
+        """Record traded volume at `timestamp` (defaults to now)"""
+        bucket = int(time.time() if timestamp is None else timestamp) // self.resolution
+        with self._lock:
+            self._add(user_id, bucket, amount)
+
+    def _add(self, user_id: str, bucket: int, amount: float):
+        volume = self._volume.get(user_id)
+        if volume is None:
+            volume = self._volume[user_id] = [0.0] * self.slots
+            self._buckets[user_id] = [-1] * self.slots
+        buckets = self._buckets[user_id]
+
+        slot = bucket % self.slots
+        if buckets[slot] == bucket:
+            volume[slot] += amount
+        elif buckets[slot] < bucket:
+            buckets[slot] = bucket
+            volume[slot] = amount
+        # Older than the bucket the slot already holds: outside the window
+
+    def snapshot(self, user_id: str, now: Optional[float] = None) -> List[float]:
+        """Volume per slot over the last `window` seconds; O(slots) regardless of trade count"""
+        oldest = int(time.time() if now is None else now) // self.resolution - self.slots
+        with self._lock:
+            volume = self._volume.get(user_id)
+            if volume is None:
+                return [0] * self.slots
+            buckets = self._buckets[user_id]
+            return [v if b > oldest else 0 for v, b in zip(volume, buckets)]
+
+    def load(self, rows: Iterable[Tuple[str, int, float]]):
+        """
+        Replace the buffer with pre-aggregated history
+
+        Args:
+            rows: (user_id, bucket, volume) tuples, bucket = unix time // resolution
+        """
+        with self._lock:
+            self._volume.clear()
+            self._buckets.clear()
+            for user_id, bucket, volume in rows:
+                self._add(user_id, int(bucket), volume or 0)
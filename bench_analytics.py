@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark wallet history aggregation
+Compares the original per-trade Python loop with the vectorized NumPy engine
+"""
+
+import random
+import time
+from datetime import datetime
+
+import numpy as np
+
+from wallet_analytics import to_columns, summarize
+
+SIZES = [1_000, 100_000, 1_000_000]
+
+
+def make_trades(count, seed=42):
+    """Synthetic (timestamp, is_buy, size, price) rows spread over ~2 years"""
+    rng = random.Random(seed)
+    start = 1_650_000_000
+    return [
+        (start + rng.randrange(0, 2 * 365 * 86400), rng.random() < 0.6,
+         rng.uniform(1, 50), rng.uniform(0.01, 0.99))
+        for _ in range(count)
+    ]
+
+
+def legacy_aggregate(trades):
+    """The pure-Python passes fetch_wallet_history used before the NumPy engine"""
+    rows = []
+    total_volume = 0
+    buy_value = 0
+    sell_value = 0
+
+    for timestamp, is_buy, size, price in trades:
+        value = size * price
+        trade_data = {
+            'timestamp': timestamp,
+            'side': 'BUY' if is_buy else 'SELL',
+            'size': size,
+            'price': price,
+            'value': value
+        }
+        if trade_data['side'] == 'BUY':
+            buy_value += value
+        else:
+            sell_value += value
+        rows.append(trade_data)
+        total_volume += value
+
+    wins = sum(1 for t in rows if t['side'] == 'SELL' and t['value'] > 0)
+    total_closed = sum(1 for t in rows if t['side'] == 'SELL')
+    win_rate = (wins / total_closed * 100) if total_closed > 0 else 0
+
+    daily_data = {}
+    for trade in rows:
+        date = datetime.fromtimestamp(trade['timestamp']).strftime('%Y-%m-%d')
+        if date not in daily_data:
+            daily_data[date] = {'volume': 0, 'pnl': 0}
+        daily_data[date]['volume'] += trade['value']
+
+    sorted_dates = sorted(daily_data.keys())[-30:]
+    return {
+        'total_volume': total_volume,
+        'win_rate': round(win_rate, 1),
+        'dates': sorted_dates,
+        'volume': [daily_data[d]['volume'] for d in sorted_dates]
+    }
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    print("📊 Wallet history aggregation benchmark\n")
+    print(f"{'Trades':>10} {'Loop':>10} {'NumPy':>10} {'NumPy+load':>12} {'Speedup':>9}")
+    print("-" * 55)
+
+    for count in SIZES:
+        trades = make_trades(count)
+
+        legacy, legacy_time = timed(legacy_aggregate, trades)
+        columns, load_time = timed(to_columns, iter(trades))
+        (summary, charts), numpy_time = timed(summarize, columns)
+
+        # Both engines must agree before the timings mean anything
+        assert np.isclose(summary['total_volume'], legacy['total_volume'])
+        assert summary['win_rate'] == legacy['win_rate']
+        assert charts['dates'] == legacy['dates']
+        assert np.allclose(charts['volume'], legacy['volume'])
+
+        print(f"{count:>10,} {legacy_time * 1000:>8.1f}ms {numpy_time * 1000:>8.1f}ms "
+              f"{(numpy_time + load_time) * 1000:>10.1f}ms {legacy_time / numpy_time:>8.1f}x")
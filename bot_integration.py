@@ -7,34 +7,194 @@ Connects the main trading bot with the dashboard API
 import json
 import logging
 import asyncio
+import random
+import time
 import aiohttp
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import threading
 from decimal import Decimal
 
+from trade_outbox import TradeOutbox, DASHBOARD_OUTBOX_PATH
+
 logger = logging.getLogger(__name__)
 
+# Trade reporting: flush a batch when it reaches TRADE_BATCH_SIZE trades or
+# when its oldest trade has waited TRADE_BATCH_MAX_LATENCY seconds
+TRADE_BATCH_SIZE = 50
+TRADE_BATCH_MAX_LATENCY = 0.5
+
+# Exponential backoff while the dashboard API is failing
+TRADE_RETRY_BASE_DELAY = 0.5
+TRADE_RETRY_MAX_DELAY = 30.0
+
+# Threads running the bot's blocking order placement
+BOT_EXECUTOR_WORKERS = 4
+
+# Seconds between wallet status syncs; only wallets that changed are sent
+WALLET_SYNC_INTERVAL = 30
+
+# Bot method that claims resolved positions; wrapped to record each settlement.
+# It returns a list of settled positions, each a dict with its realised 'pnl'.
+BOT_SETTLEMENT_METHOD = 'claim_positions'
+
+# Rolling statistics: 24h window kept in 5-minute buckets
+STATS_WINDOW = 24 * 3600
+STATS_RESOLUTION = 300
+
+# Upper bounds (ms) of the latency histogram buckets
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+def _is_rejection(status: Optional[int]) -> bool:
+    """A 4xx other than 429: the API refused the request and resending it will not help"""
+    return status is not None and 400 <= status < 500 and status != 429
+
+
+class LatencyHistogram:
+    """
+    Latency histogram with fixed millisecond buckets
+    Percentiles are reported as the upper bound of the bucket they fall in,
+    capped at the largest value observed
+    """
+
+    def __init__(self, buckets_ms: List[float] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = list(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        """Record one duration"""
+        ms = seconds * 1000
+        index = next((i for i, bound in enumerate(self.buckets_ms) if ms <= bound), len(self.buckets_ms))
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += ms
+            self.max = max(self.max, ms)
+
+    def _percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets_ms + [self.max], self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, round(self.max, 2))
+        return self.max
+
+    def snapshot(self) -> Dict:
+        """Count, mean, max, p50/p95/p99 and per-bucket counts (all in ms)"""
+        with self._lock:
+            buckets = {f"le_{bound}": count for bound, count in zip(self.buckets_ms, self.counts)}
+            buckets['le_inf'] = self.counts[-1]
+            return {
+                'count': self.count,
+                'mean_ms': round(self.total / self.count, 2) if self.count else 0,
+                'max_ms': round(self.max, 2),
+                'p50_ms': self._percentile(0.50),
+                'p95_ms': self._percentile(0.95),
+                'p99_ms': self._percentile(0.99),
+                'buckets': buckets
+            }
+
+
+class RollingWindow:
+    """
+    Sliding-window sums of a fixed set of fields
+
+    Values land in time buckets of `resolution` seconds; running totals are
+    kept alongside, so add() and totals() are O(1) amortised however many
+    events the window holds.
+    """
+
+    def __init__(self, fields: List[str], window: int = STATS_WINDOW, resolution: int = STATS_RESOLUTION):
+        self.fields = list(fields)
+        self.resolution = resolution
+        self.slots = max(1, window // resolution)
+        self._buckets = deque()  # (bucket index, [value per field])
+        self._totals = [0.0] * len(self.fields)
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> int:
+        current = int(now) // self.resolution
+        while self._buckets and self._buckets[0][0] <= current - self.slots:
+            _, values = self._buckets.popleft()
+            for i, value in enumerate(values):
+                self._totals[i] -= value
+        if not self._buckets:
+            # Drop accumulated float error whenever the window empties
+            self._totals = [0.0] * len(self.fields)
+        return current
+
+    def add(self, now: Optional[float] = None, **values: float):
+        """Add field values at `now` (defaults to the current time)"""
+        with self._lock:
+            self._add(time.time() if now is None else now, values)
+
+    def _add(self, now: float, values: Dict[str, float]):
+        current = self._expire(now)
+        if not self._buckets or self._buckets[-1][0] != current:
+            self._buckets.append((current, [0.0] * len(self.fields)))
+        bucket = self._buckets[-1][1]
+        for i, field in enumerate(self.fields):
+            value = values.get(field, 0)
+            bucket[i] += value
+            self._totals[i] += value
+
+    def totals(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Sum of every field over the window ending at `now`"""
+        with self._lock:
+            self._expire(time.time() if now is None else now)
+            return dict(zip(self.fields, self._totals))
+
+
 class DashboardIntegration:
     """
     Integration class to connect trading bot with dashboard
     Reports trades, statistics, and wallet status to dashboard API
     """
 
-    def __init__(self, api_url: str = "http://localhost:5000/api", user_id: str = "default"):
+    def __init__(self, api_url: str = "http://localhost:5000/api", user_id: str = "default",
+                 batch_size: int = TRADE_BATCH_SIZE, max_latency: float = TRADE_BATCH_MAX_LATENCY,
+                 outbox_path: str = DASHBOARD_OUTBOX_PATH):
         """
         Initialize dashboard integration
 
         Args:
             api_url: Dashboard API URL
             user_id: User identifier for this bot instance
+            batch_size: Maximum trades per batch request
+            max_latency: Seconds a queued trade may wait before its batch is flushed
+            outbox_path: SQLite file holding trades until the dashboard acknowledges them
         """
         self.api_url = api_url
         self.user_id = user_id
         self.session = None
         self._running = False
         self._report_thread = None
-        self._trade_queue = asyncio.Queue()
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self._outbox = TradeOutbox(outbox_path)
+        self._trade_ready = asyncio.Event()
+        self._reporter_task = None
+        self._stats_window = RollingWindow(['volume', 'trades', 'settled', 'wins', 'pnl'])
+        self._open_positions = 0
+        self._tracks_settlements = False
+        self.adapter: Optional['TradingBotDashboardAdapter'] = None
+        self._metrics = {
+            'queued': 0,
+            'sent': 0,
+            'batches': 0,
+            'retries': 0,
+            'rejected': 0
+        }
 
     async def start(self):
         """Start the integration service"""
@@ -42,7 +202,7 @@ class DashboardIntegration:
         self.session = aiohttp.ClientSession()
 
         # Start background tasks
-        asyncio.create_task(self._trade_reporter())
+        self._reporter_task = asyncio.create_task(self._trade_reporter())
         asyncio.create_task(self._stats_reporter())
 
         logger.info(f"Dashboard integration started for user {self.user_id}")
@@ -50,10 +210,28 @@ class DashboardIntegration:
     async def stop(self):
         """Stop the integration service"""
         self._running = False
+
+        # Give the reporter a moment to flush what is still queued
+        if self._reporter_task:
+            try:
+                await asyncio.wait_for(self._reporter_task, timeout=5.0)
+            except asyncio.TimeoutError:
+                logger.warning(f"Dashboard integration stopped with {len(self._outbox)} trades left in the outbox")
+
         if self.session:
             await self.session.close()
+        await asyncio.to_thread(self._outbox.close)
         logger.info("Dashboard integration stopped")
 
+    def metrics(self) -> Dict:
+        """Trade reporter counters, current outbox depth and the adapter's order latency"""
+        metrics = dict(self._metrics)
+        metrics['outbox_depth'] = len(self._outbox)
+        metrics['avg_batch_size'] = round(metrics['sent'] / metrics['batches'], 1) if metrics['batches'] else 0
+        if self.adapter:
+            metrics['order_latency'] = self.adapter.latency_metrics()
+        return metrics
+
     async def report_trade(self, trade_data: Dict):
         """
         Report a trade to the dashboard
@@ -68,6 +246,7 @@ class DashboardIntegration:
                 - price: Execution price
                 - status: pending, filled, cancelled
                 - tx_hash: Transaction hash
+                - idempotency_key: Optional; defaults to tx_hash, or a random id
         """
         try:
             # Add user_id to trade data
@@ -78,36 +257,110 @@ class DashboardIntegration:
                 if key in trade_data and isinstance(trade_data[key], Decimal):
                     trade_data[key] = float(trade_data[key])
 
-            # Queue trade for reporting
-            await self._trade_queue.put(trade_data)
+            # Persist before acknowledging, so the trade survives outages and restarts;
+            # SQLite runs on a worker thread so a slow disk cannot stall the event loop
+            await asyncio.to_thread(self._outbox.append, trade_data)
+            self._record_trade(trade_data)
+            self._metrics['queued'] += 1
+            self._trade_ready.set()
 
         except Exception as e:
             logger.error(f"Error queueing trade for dashboard: {e}")
 
     async def _trade_reporter(self):
-        """Background task to report trades to dashboard"""
-        while self._running:
+        """
+        Background task draining the outbox to the dashboard in micro-batches
+
+        Trades leave the outbox only after the API acknowledges their batch
+        (at-least-once); the backend drops re-sent copies by idempotency key.
+        While the API is failing the same batch is retried with exponential
+        backoff, and a backlog is replayed in full batches once it recovers.
+        A batch the API rejects is re-sent one trade at a time, so only the
+        trades that are invalid on their own are dropped.
+        """
+        failures = 0
+        while True:
             try:
-                # Get trade from queue (with timeout to allow checking _running)
-                trade_data = await asyncio.wait_for(
-                    self._trade_queue.get(),
-                    timeout=1.0
-                )
+                self._trade_ready.clear()
+                batch = await asyncio.to_thread(self._outbox.peek, self.batch_size)
+                if not batch:
+                    if not self._running:
+                        return
+                    try:
+                        # Timeout allows checking _running
+                        await asyncio.wait_for(self._trade_ready.wait(), timeout=1.0)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                # Give a partial batch until its oldest trade is max_latency old to fill up
+                if len(batch) < self.batch_size and self._running:
+                    wait = self.max_latency - await asyncio.to_thread(self._outbox.oldest_age)
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                        batch = await asyncio.to_thread(self._outbox.peek, self.batch_size)
+
+                status = await self._post_batch([trade for _, trade in batch])
+                if status == 200:
+                    await asyncio.to_thread(self._outbox.ack, [seq for seq, _ in batch])
+                    self._metrics['sent'] += len(batch)
+                    self._metrics['batches'] += 1
+                    failures = 0
+                    logger.debug(f"Reported {len(batch)} trades to dashboard")
+                    continue
+
+                if _is_rejection(status) and await self._isolate_rejected(batch):
+                    failures = 0
+                    continue
+
+                if not self._running:
+                    return
+                self._metrics['retries'] += 1
+                delay = min(TRADE_RETRY_MAX_DELAY, TRADE_RETRY_BASE_DELAY * 2 ** failures)
+                failures += 1
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
 
-                # Send to dashboard API
-                async with self.session.post(
-                    f"{self.api_url}/trades",
-                    json=trade_data
-                ) as response:
-                    if response.status == 200:
-                        logger.debug(f"Trade reported to dashboard: {trade_data['market_question'][:50]}")
-                    else:
-                        logger.error(f"Failed to report trade: {response.status}")
-
-            except asyncio.TimeoutError:
-                continue
             except Exception as e:
-                logger.error(f"Error reporting trade: {e}")
+                logger.error(f"Error reporting trades: {e}")
+                await asyncio.sleep(TRADE_RETRY_BASE_DELAY)
+
+    async def _isolate_rejected(self, batch: List[Tuple[int, Dict]]) -> bool:
+        """
+        Re-send a rejected batch one trade at a time
+
+        Trades the API accepts are acknowledged as sent, trades it still
+        rejects are dropped. Stops at the first transient failure, leaving
+        that trade and the rest in the outbox for the normal retry.
+
+        Returns:
+            True if every trade in the batch was resolved
+        """
+        for seq, trade in batch:
+            status = await self._post_batch([trade])
+            if status == 200:
+                self._metrics['sent'] += 1
+                self._metrics['batches'] += 1
+            elif _is_rejection(status):
+                self._metrics['rejected'] += 1
+                logger.error(f"Dashboard rejected trade {trade.get('idempotency_key')}: {status}")
+            else:
+                return False
+            await asyncio.to_thread(self._outbox.ack, [seq])
+        return True
+
+    async def _post_batch(self, batch: List[Dict]) -> Optional[int]:
+        """POST one batch to /trades/batch; returns the HTTP status, or None if the request failed"""
+        try:
+            async with self.session.post(
+                f"{self.api_url}/trades/batch",
+                json=batch
+            ) as response:
+                if response.status != 200:
+                    logger.warning(f"Failed to report trades: {response.status}")
+                return response.status
+        except Exception as e:
+            logger.warning(f"Error reporting trades: {e}")
+            return None
 
     async def update_wallet_status(self, wallet_number: int, status: Dict):
         """
@@ -116,25 +369,46 @@ class DashboardIntegration:
         Args:
             wallet_number: Wallet number (1-12)
             status: Status information including:
+                - address: Wallet address
                 - is_active: Whether wallet is active
-                - balance: Current USDC balance
-                - position_count: Number of open positions
-                - daily_volume: Today's volume
-                - pnl: Today's P&L
+                - position: UP, DOWN or auto
+                - order_amount: Order size in USDC
         """
-        try:
-            endpoint = f"{self.api_url}/wallets/{wallet_number}/status"
-            status['user_id'] = self.user_id
+        await self.update_wallet_statuses({wallet_number: status})
+
+    async def update_wallet_statuses(self, statuses: Dict[int, Dict]) -> bool:
+        """
+        Update the status of many wallets in one request
 
-            async with self.session.post(endpoint, json=status) as response:
+        Args:
+            statuses: Wallet number -> status dict (see update_wallet_status)
+
+        Returns:
+            True if the dashboard accepted the update
+        """
+        if not statuses:
+            return True
+
+        try:
+            payload = {
+                'user_id': self.user_id,
+                'wallets': [
+                    dict(status, wallet_number=number)
+                    for number, status in sorted(statuses.items())
+                ]
+            }
+
+            async with self.session.post(f"{self.api_url}/wallets/status", json=payload) as response:
                 if response.status == 200:
-                    logger.debug(f"Wallet {wallet_number} status updated")
-                else:
-                    logger.error(f"Failed to update wallet status: {response.status}")
+                    logger.debug(f"Status updated for {len(statuses)} wallets")
+                    return True
+                logger.error(f"Failed to update wallet status: {response.status}")
 
         except Exception as e:
             logger.error(f"Error updating wallet status: {e}")
 
+        return False
+
     async def _stats_reporter(self):
         """Background task to periodically report statistics"""
         while self._running:
@@ -153,22 +427,69 @@ class DashboardIntegration:
                     if response.status == 200:
                         logger.debug("Statistics updated on dashboard")
 
+                self._log_order_latency()
+
             except Exception as e:
                 logger.error(f"Error reporting statistics: {e}")
 
+    def _log_order_latency(self):
+        """Log order placement latency percentiles for each wrapped bot method"""
+        if not self.adapter:
+            return
+        for name, snapshot in self.adapter.latency_metrics().items():
+            if snapshot['count']:
+                logger.info(f"Order latency {name}: n={snapshot['count']} p50={snapshot['p50_ms']}ms "
+                            f"p95={snapshot['p95_ms']}ms p99={snapshot['p99_ms']}ms max={snapshot['max_ms']}ms")
+
+    def _record_trade(self, trade_data: Dict):
+        """Fold a reported trade into the rolling statistics"""
+        if trade_data.get('status') == 'cancelled':
+            return
+        self._stats_window.add(volume=float(trade_data.get('amount') or 0), trades=1)
+
+        # Pair legs are reported as pending limit orders; each is a position until settled
+        if trade_data.get('status') in ('pending', 'filled'):
+            self._open_positions += 1
+
+    def record_settlement(self, pnl: float):
+        """
+        Record a position closing or resolving
+
+        TradingBotDashboardAdapter calls this for every position its bot's
+        BOT_SETTLEMENT_METHOD settles. Until it is called at least once,
+        active positions, win rate and P&L are left out of the reported
+        statistics because nothing here can compute them.
+
+        Args:
+            pnl: Realised profit/loss of the position in USDC (> 0 counts as a win)
+        """
+        pnl = float(pnl)
+        self._tracks_settlements = True
+        self._stats_window.add(settled=1, wins=1 if pnl > 0 else 0, pnl=pnl)
+        self._open_positions = max(0, self._open_positions - 1)
+
     async def _gather_statistics(self) -> Dict:
-        """Gather current bot statistics"""
-        # This would integrate with the main bot to get real statistics
-        # For now, return placeholder data
-        return {
+        """
+        Gather current bot statistics from the rolling 24h window
+
+        Position fields are only included once settlements are being recorded
+        """
+        totals = self._stats_window.totals()
+        stats = {
             'timestamp': datetime.now().isoformat(),
-            'total_volume_24h': 0,
-            'total_trades_24h': 0,
-            'active_positions': 0,
-            'win_rate': 0,
-            'profit_loss_24h': 0
+            'total_volume_24h': round(totals['volume'], 6),
+            'total_trades_24h': int(totals['trades'])
         }
 
+        if self._tracks_settlements:
+            settled = totals['settled']
+            stats.update({
+                'active_positions': self._open_positions,
+                'win_rate': round(totals['wins'] / settled * 100, 1) if settled else 0,
+                'profit_loss_24h': round(totals['pnl'], 6)
+            })
+        return stats
+
 
 class TradingBotDashboardAdapter:
     """
@@ -186,6 +507,19 @@ class TradingBotDashboardAdapter:
         """
         self.bot = bot_instance
         self.dashboard = dashboard_integration
+        self.dashboard.adapter = self
+
+        # Wallet states the dashboard has acknowledged, for diffing in sync_wallets
+        self._last_wallet_snapshot: Dict[int, Dict] = {}
+
+        # Blocking order placement runs here, never on the integration event loop
+        self._executor = ThreadPoolExecutor(max_workers=BOT_EXECUTOR_WORKERS, thread_name_prefix='bot-orders')
+        self._report_tasks = set()
+        self._wallet_sync_task = None
+        self.latency = {
+            'buy_wallet_pair': LatencyHistogram(),
+            'buy_random_side': LatencyHistogram()
+        }
 
         # Wrap bot methods to report to dashboard
         self._wrap_methods()
@@ -196,101 +530,160 @@ class TradingBotDashboardAdapter:
         # Save original methods
         original_buy_wallet_pair = self.bot.buy_wallet_pair
         original_buy_random_side = self.bot.buy_random_side
+        original_settle = getattr(self.bot, BOT_SETTLEMENT_METHOD, None)
 
         # Create wrapped version of buy_wallet_pair
         async def wrapped_buy_wallet_pair(pair_idx: int, market: Dict) -> Optional[Dict]:
-            # Call original method
-            result = original_buy_wallet_pair(pair_idx, market)
+            # Place orders off the event loop
+            result = await self._run_order('buy_wallet_pair', original_buy_wallet_pair, pair_idx, market)
 
-            # Report to dashboard if successful
+            # Report to dashboard in the background if successful
             if result:
-                pair = self.bot.wallet_pairs[pair_idx]
-
-                # Report trade for wallet 1
-                if result.get('order_id1'):
-                    await self.dashboard.report_trade({
-                        'wallet_id': pair[0] + 1,
-                        'wallet_number': pair[0] + 1,
-                        'market_id': market['market_id'],
-                        'market_question': market['question'],
-                        'side': 'UP',
-                        'amount': result.get('size', 5) * 0.49,
-                        'price': 0.49,
-                        'status': 'pending',
-                        'tx_hash': result.get('order_id1')
-                    })
-
-                # Report trade for wallet 2
-                if result.get('order_id2'):
-                    await self.dashboard.report_trade({
-                        'wallet_id': pair[1] + 1,
-                        'wallet_number': pair[1] + 1,
-                        'market_id': market['market_id'],
-                        'market_question': market['question'],
-                        'side': 'DOWN',
-                        'amount': result.get('size', 5) * 0.49,
-                        'price': 0.49,
-                        'status': 'pending',
-                        'tx_hash': result.get('order_id2')
-                    })
+                self._hand_off(self._report_pair_trades(pair_idx, market, result))
 
             return result
 
         # Create wrapped version of buy_random_side
         async def wrapped_buy_random_side(market: Dict) -> Optional[Dict]:
-            # Call original method
-            result = original_buy_random_side(market)
+            # Place order off the event loop
+            result = await self._run_order('buy_random_side', original_buy_random_side, market)
 
-            # Report to dashboard if successful
+            # Report to dashboard in the background if successful
             if result:
-                await self.dashboard.report_trade({
-                    'wallet_id': 1,  # Default to wallet 1 for single wallet trades
-                    'wallet_number': 1,
-                    'market_id': market['market_id'],
-                    'market_question': market['question'],
-                    'side': result['side'],
-                    'amount': result.get('size', 5) * result.get('buy_price', 0.5),
-                    'price': result.get('buy_price', 0.5),
-                    'status': result.get('status', 'pending'),
-                    'tx_hash': result.get('buy_order_id')
-                })
+                self._hand_off(self._report_single_trade(market, result))
 
             return result
 
+        # Create wrapped version of the settlement method
+        async def wrapped_settle(*args, **kwargs) -> Optional[List[Dict]]:
+            loop = asyncio.get_running_loop()
+            settled = await loop.run_in_executor(self._executor, partial(original_settle, *args, **kwargs))
+
+            for position in settled or []:
+                self.dashboard.record_settlement(position.get('pnl', 0))
+
+            return settled
+
         # Replace methods
         self.bot.buy_wallet_pair = wrapped_buy_wallet_pair
         self.bot.buy_random_side = wrapped_buy_random_side
-
-    async def sync_wallets(self):
-        """Sync wallet information with dashboard"""
+        if original_settle:
+            setattr(self.bot, BOT_SETTLEMENT_METHOD, wrapped_settle)
+        else:
+            logger.warning(f"Bot has no {BOT_SETTLEMENT_METHOD}(); position statistics will not be reported")
+
+    async def _run_order(self, name: str, func, *args):
+        """Run a blocking bot call on the order executor and record its latency"""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.latency[name].observe(time.perf_counter() - started)
+
+    def _hand_off(self, coro):
+        """Run dashboard reporting as a background task so order placement never waits on it"""
+        task = asyncio.create_task(coro)
+        self._report_tasks.add(task)
+        task.add_done_callback(self._report_done)
+
+    def _report_done(self, task: asyncio.Task):
+        self._report_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Error reporting trade to dashboard: {task.exception()}")
+
+    async def _report_pair_trades(self, pair_idx: int, market: Dict, result: Dict):
+        """Report both legs of a pair buy"""
+        pair = self.bot.wallet_pairs[pair_idx]
+
+        # Report trade for wallet 1
+        if result.get('order_id1'):
+            await self.dashboard.report_trade({
+                'wallet_id': pair[0] + 1,
+                'wallet_number': pair[0] + 1,
+                'market_id': market['market_id'],
+                'market_question': market['question'],
+                'side': 'UP',
+                'amount': result.get('size', 5) * 0.49,
+                'price': 0.49,
+                'status': 'pending',
+                'tx_hash': result.get('order_id1')
+            })
+
+        # Report trade for wallet 2
+        if result.get('order_id2'):
+            await self.dashboard.report_trade({
+                'wallet_id': pair[1] + 1,
+                'wallet_number': pair[1] + 1,
+                'market_id': market['market_id'],
+                'market_question': market['question'],
+                'side': 'DOWN',
+                'amount': result.get('size', 5) * 0.49,
+                'price': 0.49,
+                'status': 'pending',
+                'tx_hash': result.get('order_id2')
+            })
+
+    async def _report_single_trade(self, market: Dict, result: Dict):
+        """Report a single-side buy"""
+        await self.dashboard.report_trade({
+            'wallet_id': 1,  # Default to wallet 1 for single wallet trades
+            'wallet_number': 1,
+            'market_id': market['market_id'],
+            'market_question': market['question'],
+            'side': result['side'],
+            'amount': result.get('size', 5) * result.get('buy_price', 0.5),
+            'price': result.get('buy_price', 0.5),
+            'status': result.get('status', 'pending'),
+            'tx_hash': result.get('buy_order_id')
+        })
+
+    def latency_metrics(self) -> Dict[str, Dict]:
+        """Order placement latency histograms per wrapped method"""
+        return {name: histogram.snapshot() for name, histogram in self.latency.items()}
+
+    def _wallet_snapshot(self) -> Dict[int, Dict]:
+        """Current state of every wallet, keyed by wallet number"""
+        snapshot = {}
         for idx, pair in enumerate(self.bot.wallet_pairs):
-            pair_number = idx + 1
-
-            # Update wallet 1 of pair
-            wallet1_idx = pair[0]
-            wallet1_address = self.bot.wallet_addresses[wallet1_idx]
-            await self.dashboard.update_wallet_status(
-                wallet1_idx + 1,
-                {
-                    'address': wallet1_address,
-                    'is_active': not self.bot.is_pair_disabled(idx),
-                    'position': 'UP',
-                    'order_amount': self.bot.get_pair_amount(idx)
+            is_active = not self.bot.is_pair_disabled(idx)
+            order_amount = self.bot.get_pair_amount(idx)
+
+            # Wallet 1 of each pair buys UP, wallet 2 buys DOWN
+            for wallet_idx, position in ((pair[0], 'UP'), (pair[1], 'DOWN')):
+                snapshot[wallet_idx + 1] = {
+                    'address': self.bot.wallet_addresses[wallet_idx],
+                    'is_active': is_active,
+                    'position': position,
+                    'order_amount': float(order_amount)
                 }
-            )
-
-            # Update wallet 2 of pair
-            wallet2_idx = pair[1]
-            wallet2_address = self.bot.wallet_addresses[wallet2_idx]
-            await self.dashboard.update_wallet_status(
-                wallet2_idx + 1,
-                {
-                    'address': wallet2_address,
-                    'is_active': not self.bot.is_pair_disabled(idx),
-                    'position': 'DOWN',
-                    'order_amount': self.bot.get_pair_amount(idx)
-                }
-            )
+        return snapshot
+
+    async def sync_wallets(self):
+        """Sync wallet information with dashboard, sending only wallets that changed"""
+        snapshot = self._wallet_snapshot()
+        changed = {
+            number: status for number, status in snapshot.items()
+            if self._last_wallet_snapshot.get(number) != status
+        }
+        if not changed:
+            return
+
+        if await self.dashboard.update_wallet_statuses(changed):
+            self._last_wallet_snapshot.update(changed)
+
+    def start_wallet_sync(self, interval: float = WALLET_SYNC_INTERVAL):
+        """Keep the dashboard's wallet status current while the integration runs"""
+        self._wallet_sync_task = asyncio.create_task(self._wallet_syncer(interval))
+
+    async def _wallet_syncer(self, interval: float):
+        """Background task re-syncing wallet status every `interval` seconds"""
+        while self.dashboard._running:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync_wallets()
+            except Exception as e:
+                logger.error(f"Error syncing wallets with dashboard: {e}")
 
 
 def integrate_with_dashboard(bot_instance, api_url: str = "http://localhost:5000/api", user_id: str = None):
@@ -303,7 +696,8 @@ def integrate_with_dashboard(bot_instance, api_url: str = "http://localhost:5000
         user_id: User identifier (will use wallet address if not provided)
 
     Returns:
-        DashboardIntegration instance
+        DashboardIntegration instance; its `adapter` wraps the bot and
+        its metrics() include the adapter's order latency
     """
     # Generate user_id from wallet address if not provided
     if not user_id:
@@ -319,6 +713,7 @@ def integrate_with_dashboard(bot_instance, api_url: str = "http://localhost:5000
     async def start_integration():
         await dashboard.start()
         await adapter.sync_wallets()
+        adapter.start_wallet_sync()
 
     # Run in event loop
     loop = asyncio.new_event_loop()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+CLOB trade sync check for the complete dashboard
+Runs fetch_wallet_stats against mocked CLOB responses on a scratch trade store
+and checks paging, the sync mark and which results reach the wallet cache
+"""
+
+import os
+import sys
+import tempfile
+from unittest import mock
+
+# Point the trade store at a scratch database before the dashboard opens it
+os.environ['TRADE_STORE_PATH'] = os.path.join(tempfile.mkdtemp(), 'check_trade_store.db')
+
+import complete_dashboard as dashboard  # noqa: E402
+
+failures = 0
+
+
+def check(name, ok):
+    global failures
+    failures += not ok
+    print(f"{'✅' if ok else '❌'} {name}")
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+def clob_trade(n):
+    return {'id': f'trade-{n}', 'match_time': 1700000000 + n, 'market': 'check-market',
+            'side': 'BUY', 'size': 10, 'price': 0.5}
+
+
+def fetch_with(address, responses):
+    """Fetch `address` through the wallet cache with the CLOB answering `responses` in turn"""
+    with mock.patch.object(dashboard.requests, 'get', side_effect=responses) as get:
+        stats = dashboard.WALLET_CACHE.get(address)
+    return stats, get.call_count
+
+
+def main():
+    print("🔄 Checking the CLOB trade sync\n")
+
+    # A 503 on the first page with nothing stored is an error, not an inactive wallet
+    address = '0x0000000000000000000000000000000000000503'
+    stats, _ = fetch_with(address, [FakeResponse(503)])
+    check("503 with an empty store reports 'Error'", stats['status'] == 'Error')
+    check("503 result is not cached", dashboard.WALLET_CACHE.metrics()['size'] == 0)
+
+    stats, calls = fetch_with(address, [FakeResponse(200, {'data': [clob_trade(1)], 'next_cursor': 'LTE='})])
+    check("next request retries the CLOB", calls == 1 and stats['status'] == 'Active' and stats['trades'] == 1)
+
+    # A 503 part-way through keeps the trades already fetched but not the sync mark
+    address = '0x0000000000000000000000000000000000000504'
+    dashboard.CLOB_TRADES_LIMIT = 2
+    try:
+        stats, calls = fetch_with(address, [
+            FakeResponse(200, {'data': [clob_trade(1), clob_trade(2)], 'next_cursor': 'Mg=='}),
+            FakeResponse(503)
+        ])
+    finally:
+        dashboard.CLOB_TRADES_LIMIT = 1000
+    check("503 on a later page keeps the fetched trades", calls == 2 and stats['trades'] == 2)
+    check("503 on a later page keeps the sync mark", dashboard.TRADE_STORE.high_water_mark(address, 'clob')[0] == 0)
+
+    print(f"\n{'All CLOB sync checks passed' if not failures else f'{failures} CLOB sync checks failed'}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,9 +3,7 @@
 Check actual wallet status from Polymarket
 """
 
-import requests
-import json
-from time import sleep
+from subgraph import fetch_users
 
 # All wallet funder addresses
 wallets = [
@@ -25,46 +23,32 @@ wallets = [
 
 print("🔍 Checking wallet status on Polymarket...\n")
 
+# Resolve every wallet with one batched Graph API query
+users = fetch_users([address for _, address in wallets])
+
 for name, address in wallets:
     print(f"Checking {name}: {address}")
 
     # Check profile page (this is public data)
     profile_url = f"https://polymarket.com/profile/{address}"
 
-    # Try Graph API
-    graph_url = "https://api.thegraph.com/subgraphs/name/polymarket/matic-markets-5"
-
-    query = {
-        "query": f'{{ user(id: "{address.lower()}") {{ id numTrades totalVolume }} }}'
-    }
-
-    try:
-        response = requests.post(graph_url, json=query, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('data') and data['data'].get('user'):
-                user = data['data']['user']
-                volume = float(user.get('totalVolume', 0)) / 1e6 if user.get('totalVolume') else 0
-                trades = user.get('numTrades', 0)
+    if address.lower() not in users:
+        print("  ❌ API error: subgraph lookup failed")
+    elif users[address.lower()]:
+        user = users[address.lower()]
+        volume = float(user.get('totalVolume', 0)) / 1e6 if user.get('totalVolume') else 0
+        trades = user.get('numTrades', 0)
 
-                if volume > 0 or trades > 0:
-                    print(f"  ✅ ACTIVE - Volume: ${volume:,.2f}, Trades: {trades}")
-                else:
-                    print(f"  ⚫ No activity found")
-            else:
-                print(f"  ⚫ No data in Graph")
+        if volume > 0 or trades > 0:
+            print(f"  ✅ ACTIVE - Volume: ${volume:,.2f}, Trades: {trades}")
         else:
-            print(f"  ❌ API error: {response.status_code}")
-
-    except Exception as e:
-        print(f"  ❌ Error: {e}")
+            print(f"  ⚫ No activity found")
+    else:
+        print(f"  ⚫ No data in Graph")
 
     print(f"  📊 Profile: {profile_url}")
     print()
 
-    # Small delay between requests
-    sleep(0.5)
-
 print("\n📝 Summary:")
 print("- Wallet 1 is the main trading wallet (confirmed active)")
 print("- Other wallets may not have trading history yet")
@@ -0,0 +1,159 @@
+"""
+Process-wide pool of Polymarket API clients
+Keeps keep-alive HTTP sessions warm across requests and wallets instead of
+building a fresh PolymarketDataClient (and TCP/TLS handshake) on every fetch
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_POOL_SIZE = int(os.getenv('DATA_CLIENT_POOL_SIZE', 12))
+DEFAULT_IDLE_TIMEOUT = float(os.getenv('DATA_CLIENT_IDLE_TIMEOUT', 300))
+
+
+def _close_client(client):
+    """Close the HTTP session held by a client, whatever its shape"""
+    for target in (client, getattr(client, 'client', None), getattr(client, 'session', None)):
+        close = getattr(target, 'close', None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+            return
+
+
+class ClientPool:
+    """
+    Bounded, thread-safe pool of reusable API clients
+
+    Idle clients are handed out most-recently-used first so their
+    connections stay warm; clients idle longer than `idle_timeout`
+    are closed and dropped, and so are clients whose request failed.
+    """
+
+    def __init__(self, factory, max_size=DEFAULT_POOL_SIZE, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        """
+        Args:
+            factory: Zero-argument callable that builds a new client
+            max_size: Maximum number of clients alive at once
+            idle_timeout: Seconds an unused client is kept before eviction
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._idle = []  # (client, last_used) pairs, most recently used last
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._counters = {
+            'checkouts': 0,
+            'reused': 0,
+            'created': 0,
+            'evicted': 0,
+            'discarded': 0,
+            'waits': 0
+        }
+
+    def _evict_idle(self, now):
+        """Drop idle clients past their timeout (caller holds the lock)"""
+        keep = []
+        for client, last_used in self._idle:
+            if now - last_used > self.idle_timeout:
+                _close_client(client)
+                self._counters['evicted'] += 1
+            else:
+                keep.append((client, last_used))
+        self._idle = keep
+
+    def acquire(self):
+        """Check a client out of the pool, blocking while all are in use"""
+        with self._cond:
+            self._evict_idle(time.monotonic())
+            waited = False
+            while not self._idle and self._in_use >= self.max_size:
+                waited = True
+                self._cond.wait()
+            if waited:
+                self._counters['waits'] += 1
+
+            self._counters['checkouts'] += 1
+            self._in_use += 1
+            if self._idle:
+                self._counters['reused'] += 1
+                return self._idle.pop()[0]
+
+        try:
+            client = self.factory()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._counters['created'] += 1
+        return client
+
+    def release(self, client, ok=True):
+        """
+        Return a client to the pool
+
+        Args:
+            ok: False when the request using the client failed; its session may
+                be broken (dropped connection, timeout), so it is closed instead
+        """
+        with self._cond:
+            self._in_use -= 1
+            if ok:
+                self._idle.append((client, time.monotonic()))
+            else:
+                self._counters['discarded'] += 1
+            self._cond.notify()
+
+        if not ok:
+            _close_client(client)
+
+    @contextmanager
+    def client(self):
+        """Context manager yielding a pooled client; discarded if the block raises"""
+        client = self.acquire()
+        try:
+            yield client
+        except BaseException:
+            self.release(client, ok=False)
+            raise
+        self.release(client)
+
+    def stats(self):
+        """Pool counters, including the share of checkouts served by a warm client"""
+        with self._cond:
+            counters = dict(self._counters)
+            counters['idle'] = len(self._idle)
+            counters['in_use'] = self._in_use
+            counters['max_size'] = self.max_size
+        checkouts = counters['checkouts']
+        counters['reuse_rate'] = counters['reused'] / checkouts if checkouts else 0
+        return counters
+
+    def close(self):
+        """Close every idle client"""
+        with self._cond:
+            for client, _ in self._idle:
+                _close_client(client)
+            self._idle = []
+
+
+_data_client_pool = None
+_data_client_pool_lock = threading.Lock()
+
+
+def get_data_client_pool():
+    """Return the process-wide PolymarketDataClient pool"""
+    global _data_client_pool
+    with _data_client_pool_lock:
+        if _data_client_pool is None:
+            from polymarket_apis.clients import PolymarketDataClient
+            _data_client_pool = ClientPool(PolymarketDataClient)
+        return _data_client_pool
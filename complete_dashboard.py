@@ -10,10 +10,25 @@ from flask import Flask, render_template_string, jsonify
 from flask_cors import CORS
 from datetime import datetime
 from decimal import Decimal
+from wallet_cache import WalletStatsCache
+from trade_store import TradeStore
 
 app = Flask(__name__)
 CORS(app)
 
+# CLOB trades endpoint, used to sync wallet history into the local store
+CLOB_TRADES_URL = "https://clob.polymarket.com/trades"
+CLOB_TRADES_LIMIT = 1000
+CLOB_END_CURSOR = 'LTE='  # next_cursor value the CLOB API returns after the last page
+CLOB_MAX_PAGES = 100
+CLOB_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json'
+}
+
+# Local trade history, synced incrementally from the CLOB API
+TRADE_STORE = TradeStore()
+
 # Load wallet addresses from config.json
 def load_wallet_addresses():
     """Load all funder addresses from config.json"""
@@ -221,6 +236,65 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
+def normalize_clob_trade(trade):
+    """Flatten a CLOB trade into the trade store format"""
+    return {
+        'id': trade.get('id') or trade.get('transaction_hash'),
+        'timestamp': int(float(trade.get('match_time') or trade.get('timestamp') or 0)),
+        'market': trade.get('market'),
+        'side': trade.get('side'),
+        'size': float(trade.get('size', 0)),
+        'price': float(trade.get('price', 0))
+    }
+
+def sync_clob_trades(funder_address):
+    """
+    Fetch CLOB trades newer than the wallet's high-water mark into the local store
+
+    Follows next_cursor until a short page or the end cursor, so a backlog
+    larger than one page is fetched in full before the mark moves. If a
+    full page comes back without a cursor the rest cannot be reached, so
+    the trades are stored but the mark stays put.
+
+    Raises:
+        requests.exceptions.HTTPError: The CLOB API answered a page with a
+            non-200 status; pages fetched before it are still stored
+    """
+    since, _ = TRADE_STORE.high_water_mark(funder_address, 'clob')
+
+    params = {'user': funder_address.lower(), 'limit': CLOB_TRADES_LIMIT}
+    if since:
+        # Overlap by a second so same-second trades are not missed; the store ignores duplicates
+        params['after'] = since - 1
+
+    trades = []
+    complete = False
+    error = None
+    for _ in range(CLOB_MAX_PAGES):
+        response = requests.get(CLOB_TRADES_URL, params=params, headers=CLOB_HEADERS, timeout=5)
+        if response.status_code != 200:
+            error = requests.exceptions.HTTPError(
+                f"CLOB trades returned {response.status_code}", response=response)
+            break
+
+        body = response.json() or []
+        page = (body.get('data') or []) if isinstance(body, dict) else body
+        next_cursor = body.get('next_cursor') if isinstance(body, dict) else None
+        trades.extend(normalize_clob_trade(t) for t in page)
+
+        if len(page) < CLOB_TRADES_LIMIT or next_cursor == CLOB_END_CURSOR:
+            complete = True
+            break
+        if not next_cursor:
+            print(f"CLOB returned a full page without a cursor for {funder_address}; keeping the sync mark")
+            break
+        params['next_cursor'] = next_cursor
+
+    if trades or complete:
+        TRADE_STORE.append_trades(funder_address, 'clob', [t for t in trades if t['id']], advance=complete)
+    if error:
+        raise error
+
 def fetch_wallet_stats(funder_address):
     """Fetch wallet statistics from Polymarket"""
 
@@ -248,50 +322,56 @@ def fetch_wallet_stats(funder_address):
         stats.update(known_wallets[funder_address.lower()])
         return stats
 
+    synced = False
     try:
-        # Try multiple API endpoints
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json'
-        }
-
-        # Try CLOB API for user trades
-        clob_url = f"https://clob.polymarket.com/trades?user={funder_address.lower()}&limit=100"
-        response = requests.get(clob_url, headers=headers, timeout=5)
-
-        if response.status_code == 200:
-            trades = response.json()
-            if trades and len(trades) > 0:
-                total_buy_value = 0
-                total_sell_value = 0
-
-                for trade in trades:
-                    size = float(trade.get('size', 0))
-                    price = float(trade.get('price', 0))
-                    value = size * price
-
-                    if trade.get('side') == 'BUY':
-                        total_buy_value += value
-                    else:
-                        total_sell_value += value
-
-                stats['volume'] = total_buy_value + total_sell_value
-                stats['pnl'] = total_sell_value - total_buy_value
-                stats['trades'] = len(trades)
-                stats['status'] = 'Active' if stats['volume'] > 0 else 'Inactive'
-
-                # Simple win rate calculation
-                profitable_trades = sum(1 for t in trades if t.get('side') == 'SELL' and float(t.get('price', 0)) > 0.5)
-                if stats['trades'] > 0:
-                    stats['win_rate'] = (profitable_trades / stats['trades']) * 100
-
+        # Pull only trades newer than the last sync into the local store
+        sync_clob_trades(funder_address)
+        synced = True
     except requests.exceptions.RequestException as e:
         print(f"API error for {funder_address}: {e}")
     except Exception as e:
         print(f"Error processing data for {funder_address}: {e}")
 
+    try:
+        total_buy_value = 0
+        total_sell_value = 0
+        trade_count = 0
+        profitable_trades = 0
+
+        for trade in TRADE_STORE.iter_trades(funder_address, 'clob'):
+            value = trade['size'] * trade['price']
+
+            if trade['side'] == 'BUY':
+                total_buy_value += value
+            else:
+                total_sell_value += value
+                # Simple win rate calculation
+                if trade['price'] > 0.5:
+                    profitable_trades += 1
+            trade_count += 1
+
+        if trade_count > 0:
+            stats['volume'] = total_buy_value + total_sell_value
+            stats['pnl'] = total_sell_value - total_buy_value
+            stats['trades'] = trade_count
+            stats['status'] = 'Active' if stats['volume'] > 0 else 'Inactive'
+            stats['win_rate'] = (profitable_trades / trade_count) * 100
+        elif not synced:
+            # Nothing stored and the sync failed: the zeros are not real data
+            stats['status'] = 'Error'
+
+    except Exception as e:
+        print(f"Error reading stored trades for {funder_address}: {e}")
+        stats['status'] = 'Error'
+
     return stats
 
+# Per-address cache shared by every request; failed fetches are retried, not cached
+WALLET_CACHE = WalletStatsCache(
+    fetch_wallet_stats,
+    cacheable=lambda stats: stats['status'] != 'Error'
+)
+
 @app.route('/')
 def index():
     """Serve the dashboard HTML"""
@@ -311,7 +391,7 @@ def get_wallets():
     total_wins = 0
 
     for wallet in wallets:
-        stats = fetch_wallet_stats(wallet['funder'])
+        stats = WALLET_CACHE.get(wallet['funder'])
         stats['number'] = wallet['number']
         stats['address'] = wallet['address']
 
@@ -341,6 +421,13 @@ def get_wallets():
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/metrics')
+def get_metrics():
+    """Wallet cache hit/miss/refresh counters"""
+    return jsonify({
+        'wallet_cache': WALLET_CACHE.metrics()
+    })
+
 if __name__ == '__main__':
     print("🚀 Starting Complete Polymarket Dashboard...")
     print("📊 Dashboard: http://localhost:7777")
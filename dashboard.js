@@ -3,9 +3,13 @@
 const API_BASE_URL = 'http://localhost:5000/api';
 const WS_URL = 'ws://localhost:5000/ws';
 let ws = null;
+let heartbeatTimer = null;
 let userId = null;
 let walletData = {};
 
+// Keep the socket from being reaped as idle by the backend (WS_IDLE_TIMEOUT)
+const HEARTBEAT_INTERVAL_MS = 25000;
+
 // Initialize dashboard
 document.addEventListener('DOMContentLoaded', () => {
     initializeUserId();
@@ -35,10 +39,17 @@ function copyUserId() {
 
 // WebSocket connection for real-time updates
 function initializeWebSocket() {
-    ws = new WebSocket(WS_URL);
+    // Subscribe to this user's updates only
+    ws = new WebSocket(`${WS_URL}?user_id=${encodeURIComponent(userId)}`);
 
     ws.onopen = () => {
         console.log('WebSocket connected');
+        clearInterval(heartbeatTimer);
+        heartbeatTimer = setInterval(() => {
+            if (ws.readyState === WebSocket.OPEN) {
+                ws.send(JSON.stringify({ type: 'ping' }));
+            }
+        }, HEARTBEAT_INTERVAL_MS);
         document.getElementById('connectionStatus').innerHTML =
             '<i class="fas fa-circle text-green-400 mr-2 pulse-animation"></i> Live';
     };
@@ -55,6 +66,7 @@ function initializeWebSocket() {
     };
 
     ws.onclose = () => {
+        clearInterval(heartbeatTimer);
         document.getElementById('connectionStatus').innerHTML =
             '<i class="fas fa-circle text-yellow-400 mr-2"></i> Reconnecting...';
         setTimeout(initializeWebSocket, 5000);
@@ -68,12 +80,20 @@ function handleRealtimeUpdate(data) {
             addTradeToTable(data.trade);
             updateTotalTrades();
             break;
+        case 'trades':
+            // Coalesced batch from /api/trades/batch, oldest first
+            data.trades.forEach(addTradeToTable);
+            updateTotalTrades();
+            break;
         case 'volume':
             updateVolume(data.volume);
             break;
         case 'wallet':
             updateWalletCard(data.wallet);
             break;
+        case 'wallets':
+            renderWallets(data.wallets);
+            break;
         case 'stats':
             updateStats(data.stats);
             break;
@@ -83,18 +103,21 @@ function handleRealtimeUpdate(data) {
 // Load dashboard data from API
 async function loadDashboardData() {
     try {
+        // Every read is scoped to this page's user, like the WebSocket subscription
+        const userQuery = `user_id=${encodeURIComponent(userId)}`;
+
         // Load summary stats
-        const statsResponse = await fetch(`${API_BASE_URL}/stats`);
+        const statsResponse = await fetch(`${API_BASE_URL}/stats?${userQuery}`);
         const stats = await statsResponse.json();
         updateStats(stats);
 
         // Load wallets
-        const walletsResponse = await fetch(`${API_BASE_URL}/wallets`);
+        const walletsResponse = await fetch(`${API_BASE_URL}/wallets?${userQuery}`);
         const wallets = await walletsResponse.json();
         renderWallets(wallets);
 
         // Load recent trades
-        const tradesResponse = await fetch(`${API_BASE_URL}/trades/recent`);
+        const tradesResponse = await fetch(`${API_BASE_URL}/trades/recent?${userQuery}`);
         const trades = await tradesResponse.json();
         renderTrades(trades);
 
@@ -0,0 +1,76 @@
+"""
+Concurrent fan-out helpers for the wallet dashboards
+Runs one upstream fetch per wallet in a thread pool, throttled by a shared token bucket
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    A full bucket lets a burst of `capacity` calls through at once,
+    after which callers are paced at `rate` calls per second.
+    """
+
+    def __init__(self, rate, capacity):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens the bucket can hold
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self, tokens=1):
+        """Block until `tokens` tokens are available, then consume them"""
+        tokens = min(float(tokens), self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def fan_out(func, items, limiter=None, cost=1, max_workers=12):
+    """
+    Call `func(item)` for every item concurrently and return results in input order
+
+    Args:
+        func: Callable taking a single item
+        items: Iterable of items to process
+        limiter: Optional shared TokenBucket, consulted before every call
+        cost: Tokens consumed per call (e.g. number of upstream requests it makes)
+        max_workers: Upper bound on concurrently running calls
+
+    Returns:
+        List of results, one per item, in the same order as `items`
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def run(item):
+        if limiter is not None:
+            limiter.acquire(cost)
+        return func(item)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(run, items))
@@ -5,19 +5,30 @@ Based on Grok Expert's solution
 """
 
 import json
-import time
-from flask import Flask, render_template_string, jsonify, request
+import os
+from flask import Flask, Response, render_template_string, jsonify, request
 from flask_cors import CORS
 from datetime import datetime
-from polymarket_apis.clients import PolymarketDataClient
 from collections import defaultdict
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from fanout import TokenBucket, fan_out
+from client_pool import get_data_client_pool
+from wallet_cache import WalletStatsCache
+from snapshot_poller import SnapshotPoller
 
 app = Flask(__name__)
 CORS(app)
 
+# Shared upstream rate limit: each wallet costs 3 data-api calls.
+# The burst covers one full refresh of 12 wallets, refills at 10 calls/s.
+REQUESTS_PER_WALLET = 3
+RATE_LIMITER = TokenBucket(rate=10, capacity=36)
+
+# How often the background poller rebuilds the /api/wallets snapshot
+WALLETS_REFRESH_INTERVAL = float(os.getenv('WALLETS_REFRESH_INTERVAL', 30))
+
 # Load wallet addresses from config
 def load_wallet_addresses():
     """Load Funder addresses from config.json"""
@@ -268,18 +279,18 @@ def fetch_wallet_stats(funder_address):
     try:
         print(f"Fetching {funder_address[:10]}...")
 
-        data_client = PolymarketDataClient()
-
-        # Get user metrics (includes P&L)
-        user_metric = data_client.get_user_metric(funder_address)
-        total_pnl = user_metric.amount
+        # Borrow a warm client from the shared pool
+        with get_data_client_pool().client() as data_client:
+            # Get user metrics (includes P&L)
+            user_metric = data_client.get_user_metric(funder_address)
+            total_pnl = user_metric.amount
 
-        # Get total markets traded
-        markets_traded = data_client.get_total_markets_traded(funder_address)
+            # Get total markets traded
+            markets_traded = data_client.get_total_markets_traded(funder_address)
 
-        # Get total volume from leaderboard (this is the "Volume / All" value!)
-        leaderboard_data = data_client.get_leaderboard_user_rank(funder_address)
-        total_volume = leaderboard_data.amount  # This is the accurate total volume
+            # Get total volume from leaderboard (this is the "Volume / All" value!)
+            leaderboard_data = data_client.get_leaderboard_user_rank(funder_address)
+            total_volume = leaderboard_data.amount  # This is the accurate total volume
 
         status = 'Active' if markets_traded > 0 else 'Inactive'
 
@@ -306,6 +317,17 @@ def fetch_wallet_stats(funder_address):
             'status': 'Error'
         }
 
+def fetch_wallet_stats_limited(funder_address):
+    """fetch_wallet_stats paced by the shared upstream rate limiter"""
+    RATE_LIMITER.acquire(REQUESTS_PER_WALLET)
+    return fetch_wallet_stats(funder_address)
+
+# Per-address cache shared by every request; failed fetches are not cached
+WALLET_CACHE = WalletStatsCache(
+    fetch_wallet_stats_limited,
+    cacheable=lambda stats: stats['status'] != 'Error'
+)
+
 @app.route('/')
 def index():
     """Serve the dashboard"""
@@ -346,9 +368,8 @@ def send_contact():
             'message': str(e)
         }), 500
 
-@app.route('/api/wallets')
-def get_wallets():
-    """API endpoint to fetch all wallet data"""
+def build_wallets_payload():
+    """Fetch every configured wallet and build the /api/wallets payload"""
 
     wallets = load_wallet_addresses()
     wallet_stats = []
@@ -358,8 +379,13 @@ def get_wallets():
     total_trades = 0
     active_count = 0
 
-    for wallet in wallets:
-        stats = fetch_wallet_stats(wallet['funder'])
+    # Refresh all wallets in parallel; a failed wallet falls back to its last good stats
+    results = fan_out(WALLET_CACHE.refresh, [wallet['funder'] for wallet in wallets])
+
+    if wallets and all(stats['status'] == 'Error' for stats in results):
+        raise RuntimeError("all wallet fetches failed")
+
+    for wallet, stats in zip(wallets, results):
         stats['number'] = wallet['number']
 
         wallet_stats.append(stats)
@@ -371,10 +397,7 @@ def get_wallets():
         if stats['status'] == 'Active':
             active_count += 1
 
-        # Small delay to avoid rate limits
-        time.sleep(0.3)
-
-    return jsonify({
+    return {
         'wallets': wallet_stats,
         'summary': {
             'total_volume': total_volume,
@@ -383,6 +406,28 @@ def get_wallets():
             'active_wallets': active_count
         },
         'timestamp': datetime.now().isoformat()
+    }
+
+# Precomputed /api/wallets payload, rebuilt in the background
+WALLETS_SNAPSHOT = SnapshotPoller(build_wallets_payload, interval=WALLETS_REFRESH_INTERVAL)
+
+@app.route('/api/wallets')
+def get_wallets():
+    """API endpoint serving the latest precomputed wallet snapshot"""
+
+    snapshot = WALLETS_SNAPSHOT.get()
+    if snapshot is None:
+        return jsonify({'error': 'Wallet data not available yet'}), 503
+
+    return Response(snapshot.body, mimetype='application/json',
+                    headers=WALLETS_SNAPSHOT.headers(snapshot))
+
+@app.route('/api/metrics')
+def get_metrics():
+    """Connection pool and wallet cache counters"""
+    return jsonify({
+        'client_pool': get_data_client_pool().stats(),
+        'wallet_cache': WALLET_CACHE.metrics()
     })
 
 if __name__ == '__main__':
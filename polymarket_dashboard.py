@@ -10,6 +10,8 @@ from flask import Flask, render_template_string, jsonify
 from flask_cors import CORS
 from datetime import datetime
 import time
+from wallet_cache import WalletStatsCache
+from subgraph import fetch_users, POLYMARKET_MATIC_URL
 
 app = Flask(__name__)
 CORS(app)
@@ -179,8 +181,39 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
+# Subgraph fields needed for the wallet summary
+USER_STATS_FIELDS = """
+    id
+    totalVolume
+    totalTrades
+    totalPositions
+    profitLoss
+    winCount
+    lossCount
+    positions {
+        id
+        market {
+            question
+        }
+        outcome
+        size
+        price
+        realized
+        unrealized
+    }
+"""
+
+def fetch_wallets_data(addresses):
+    """Fetch data for many wallets, resolving all subgraph lookups in one batched query"""
+    users = fetch_users(addresses, fields=USER_STATS_FIELDS, url=POLYMARKET_MATIC_URL)
+    return [build_wallet_data(address, users.get(address.lower())) for address in addresses]
+
 def fetch_wallet_data(address):
     """Fetch data for a single wallet from various Polymarket endpoints"""
+    return fetch_wallets_data([address])[0]
+
+def build_wallet_data(address, user):
+    """Build wallet data from its subgraph user entity, falling back to the CLOB API"""
 
     wallet_data = {
         'address': address,
@@ -194,79 +227,28 @@ def fetch_wallet_data(address):
     }
 
     try:
-        # GraphQL query for historical data
-        graphql_query = {
-            "query": f"""
-                query GetUserStats {{
-                    user(id: "{address.lower()}") {{
-                        id
-                        totalVolume
-                        totalTrades
-                        totalPositions
-                        profitLoss
-                        winCount
-                        lossCount
-                        positions {{
-                            id
-                            market {{
-                                question
-                            }}
-                            outcome
-                            size
-                            price
-                            realized
-                            unrealized
-                        }}
-                        trades(first: 1000, orderBy: timestamp, orderDirection: desc) {{
-                            id
-                            market {{
-                                question
-                            }}
-                            outcome
-                            side
-                            size
-                            price
-                            timestamp
-                        }}
-                    }}
-                }}
-            """
-        }
-
-        # Try Graph API endpoint
-        graph_url = "https://api.thegraph.com/subgraphs/name/polymarket/polymarket-matic"
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json',
-        }
-
-        response = requests.post(graph_url, json=graphql_query, headers=headers, timeout=10)
-
-        if response.status_code == 200:
-            data = response.json()
-            if 'data' in data and data['data'] and 'user' in data['data']:
-                user = data['data']['user']
-                if user:
-                    wallet_data['volume'] = float(user.get('totalVolume', 0)) / 1e6 if user.get('totalVolume') else 0
-                    wallet_data['pnl'] = float(user.get('profitLoss', 0)) / 1e6 if user.get('profitLoss') else 0
-                    wallet_data['trades'] = user.get('totalTrades', 0)
-                    wallet_data['positions'] = len(user.get('positions', []))
-                    wallet_data['wins'] = user.get('winCount', 0)
-                    wallet_data['losses'] = user.get('lossCount', 0)
-                    wallet_data['status'] = 'Active' if wallet_data['volume'] > 0 else 'Inactive'
-
-                    # Calculate P&L from positions if not available
-                    if wallet_data['pnl'] == 0 and 'positions' in user:
-                        for pos in user['positions']:
-                            realized = float(pos.get('realized', 0)) / 1e6 if pos.get('realized') else 0
-                            unrealized = float(pos.get('unrealized', 0)) / 1e6 if pos.get('unrealized') else 0
-                            wallet_data['pnl'] += realized + unrealized
+        if user:
+            wallet_data['volume'] = float(user.get('totalVolume', 0)) / 1e6 if user.get('totalVolume') else 0
+            wallet_data['pnl'] = float(user.get('profitLoss', 0)) / 1e6 if user.get('profitLoss') else 0
+            wallet_data['trades'] = user.get('totalTrades', 0)
+            wallet_data['positions'] = len(user.get('positions', []))
+            wallet_data['wins'] = user.get('winCount', 0)
+            wallet_data['losses'] = user.get('lossCount', 0)
+            wallet_data['status'] = 'Active' if wallet_data['volume'] > 0 else 'Inactive'
+
+            # Calculate P&L from positions if not available
+            if wallet_data['pnl'] == 0 and 'positions' in user:
+                for pos in user['positions']:
+                    realized = float(pos.get('realized', 0)) / 1e6 if pos.get('realized') else 0
+                    unrealized = float(pos.get('unrealized', 0)) / 1e6 if pos.get('unrealized') else 0
+                    wallet_data['pnl'] += realized + unrealized
 
     except Exception as e:
         print(f"Graph API error for {address}: {e}")
 
     # Fallback: Try CLOB API
     if wallet_data['volume'] == 0:
+        clob_failed = True
         try:
             # Get trade history from CLOB
             clob_url = f"https://clob.polymarket.com/trades?user={address.lower()}&limit=1000"
@@ -276,6 +258,7 @@ def fetch_wallet_data(address):
 
             response = requests.get(clob_url, headers=headers, timeout=5)
             if response.status_code == 200:
+                clob_failed = False
                 trades = response.json()
                 if trades:
                     # Calculate volume and stats from trades
@@ -300,6 +283,10 @@ def fetch_wallet_data(address):
         except Exception as e:
             print(f"CLOB API error for {address}: {e}")
 
+        if clob_failed:
+            # Neither source produced data: the zeros are not real
+            wallet_data['status'] = 'Error'
+
     # Special case for main trading wallet (from leaderboard screenshot)
     if address.lower() == "0x707a2f7b8884e45bf5aa26f0dc44aa3ae309d4ff":
         wallet_data['name'] = 'Main Trading'
@@ -312,6 +299,13 @@ def fetch_wallet_data(address):
 
     return wallet_data
 
+# Per-address cache shared by every request
+WALLET_CACHE = WalletStatsCache(
+    fetch_wallet_data,
+    fetch_many=fetch_wallets_data,
+    cacheable=lambda wallet: wallet['status'] != 'Error'
+)
+
 @app.route('/')
 def index():
     """Serve the dashboard HTML"""
@@ -327,8 +321,10 @@ def get_wallets():
     total_positions = 0
     active_count = 0
 
-    for i, address in enumerate(WALLET_ADDRESSES):
-        wallet_data = fetch_wallet_data(address)
+    # All cache misses are resolved with one batched subgraph query
+    results = WALLET_CACHE.get_many([(address,) for address in WALLET_ADDRESSES])
+
+    for i, wallet_data in enumerate(results):
 
         # Set wallet name
         if i == 0:
@@ -356,6 +352,13 @@ def get_wallets():
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/metrics')
+def get_metrics():
+    """Wallet cache hit/miss/refresh counters"""
+    return jsonify({
+        'wallet_cache': WALLET_CACHE.metrics()
+    })
+
 if __name__ == '__main__':
     print("🚀 Starting Polymarket Dashboard Server...")
     print("📊 Dashboard available at: http://localhost:8888")
@@ -4,11 +4,12 @@ Real Trading Dashboard - Uses EOA addresses that actually trade
 """
 
 import json
-import requests
 from flask import Flask, render_template_string, jsonify
 from flask_cors import CORS
 from datetime import datetime
 from decimal import Decimal
+from wallet_cache import WalletStatsCache
+from subgraph import fetch_users
 
 app = Flask(__name__)
 CORS(app)
@@ -213,79 +214,67 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
-def fetch_wallet_stats(eoa_address, funder_address):
-    """Fetch wallet statistics from Polymarket using EOA address"""
+def stats_from_user(user):
+    """Volume/trade stats from a subgraph user entity (None if unknown)"""
+    stats = {'volume': 0, 'trades': 0, 'status': 'Inactive'}
+    if user:
+        stats['volume'] = float(user.get('totalVolume', 0)) / 1e6 if user.get('totalVolume') else 0
+        stats['trades'] = int(user.get('numTrades', 0)) if user.get('numTrades') else 0
+        stats['status'] = 'Active' if stats['trades'] > 0 else 'Inactive'
+    return stats
 
-    stats = {
-        'eoa': eoa_address,
-        'funder': funder_address,
-        'volume': 0,
-        'pnl': 0,
-        'trades': 0,
-        'status': 'Inactive'
-    }
-
-    # Try fetching data for EOA address (actual trading wallet)
-    try:
-        # Try Graph API with EOA address
-        graph_url = "https://api.thegraph.com/subgraphs/name/polymarket/matic-markets-5"
-
-        query = {
-            "query": f"""
-            {{
-                user(id: "{eoa_address.lower()}") {{
-                    id
-                    numTrades
-                    totalVolume
-                    numMarkets
-                }}
-            }}
-            """
+def fetch_wallets_stats(wallet_pairs):
+    """
+    Fetch statistics for many (EOA, funder) pairs with one batched subgraph query
+
+    The EOA address (actual trading wallet) is preferred; the funder is
+    used when the EOA has no trades.
+    """
+    addresses = []
+    for eoa_address, funder_address in wallet_pairs:
+        addresses.extend([eoa_address, funder_address])
+
+    users = fetch_users(addresses)
+
+    results = []
+    for eoa_address, funder_address in wallet_pairs:
+        stats = {
+            'eoa': eoa_address,
+            'funder': funder_address,
+            'volume': 0,
+            'pnl': 0,
+            'trades': 0,
+            'status': 'Inactive'
         }
 
-        response = requests.post(graph_url, json=query, timeout=5)
-
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('data') and data['data'].get('user'):
-                user = data['data']['user']
-                stats['volume'] = float(user.get('totalVolume', 0)) / 1e6 if user.get('totalVolume') else 0
-                stats['trades'] = int(user.get('numTrades', 0)) if user.get('numTrades') else 0
-                stats['status'] = 'Active' if stats['trades'] > 0 else 'Inactive'
-
-    except Exception as e:
-        print(f"Error fetching EOA {eoa_address}: {e}")
-
-    # If no data from EOA, try funder address
-    if stats['trades'] == 0:
-        try:
-            query = {
-                "query": f"""
-                {{
-                    user(id: "{funder_address.lower()}") {{
-                        id
-                        numTrades
-                        totalVolume
-                        numMarkets
-                    }}
-                }}
-                """
-            }
+        # Try EOA address first, then fall back to the funder address
+        resolved = False
+        for address in (eoa_address, funder_address):
+            if address.lower() not in users:
+                print(f"Error fetching {address}: subgraph lookup failed")
+                continue
+            resolved = True
+            stats.update(stats_from_user(users[address.lower()]))
+            if stats['trades'] > 0:
+                break
 
-            response = requests.post(graph_url, json=query, timeout=5)
+        if not resolved:
+            stats['status'] = 'Error'
 
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('data') and data['data'].get('user'):
-                    user = data['data']['user']
-                    stats['volume'] = float(user.get('totalVolume', 0)) / 1e6 if user.get('totalVolume') else 0
-                    stats['trades'] = int(user.get('numTrades', 0)) if user.get('numTrades') else 0
-                    stats['status'] = 'Active' if stats['trades'] > 0 else 'Inactive'
+        results.append(stats)
 
-        except Exception as e:
-            print(f"Error fetching funder {funder_address}: {e}")
+    return results
 
-    return stats
+def fetch_wallet_stats(eoa_address, funder_address):
+    """Fetch wallet statistics from Polymarket using EOA address"""
+    return fetch_wallets_stats([(eoa_address, funder_address)])[0]
+
+# Per-wallet cache keyed by (EOA, funder) and shared by every request
+WALLET_CACHE = WalletStatsCache(
+    fetch_wallet_stats,
+    fetch_many=fetch_wallets_stats,
+    cacheable=lambda stats: stats['status'] != 'Error'
+)
 
 @app.route('/')
 def index():
@@ -304,8 +293,10 @@ def get_wallets():
     total_trades = 0
     active_count = 0
 
-    for wallet in wallets:
-        stats = fetch_wallet_stats(wallet['address'], wallet['funder'])
+    # All cache misses are resolved with one batched subgraph query
+    results = WALLET_CACHE.get_many([(wallet['address'], wallet['funder']) for wallet in wallets])
+
+    for wallet, stats in zip(wallets, results):
         stats['number'] = wallet['number']
 
         wallet_stats.append(stats)
@@ -328,6 +319,13 @@ def get_wallets():
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/metrics')
+def get_metrics():
+    """Wallet cache hit/miss/refresh counters"""
+    return jsonify({
+        'wallet_cache': WALLET_CACHE.metrics()
+    })
+
 if __name__ == '__main__':
     print("🚀 Starting Real Trading Dashboard...")
     print("📊 Dashboard: http://localhost:5555")
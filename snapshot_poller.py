@@ -0,0 +1,102 @@
+"""
+Background snapshot poller for dashboard API payloads
+Periodically rebuilds a payload off the request path and keeps it as an
+immutable, pre-serialized JSON blob that endpoints can serve as-is
+"""
+
+import json
+import random
+import threading
+import time
+from collections import namedtuple
+
+# body: serialized JSON bytes, built_at: time.time() of the build
+Snapshot = namedtuple('Snapshot', ['body', 'built_at'])
+
+
+class SnapshotPoller:
+    """
+    Keeps the latest good snapshot of `build()` in memory
+
+    A daemon thread rebuilds it every `interval` seconds (± `jitter`
+    fraction). If a build raises, the previous snapshot keeps being
+    served and is reported as stale.
+    """
+
+    def __init__(self, build, interval=30, jitter=0.1, name='snapshot-poller'):
+        """
+        Args:
+            build: Zero-argument callable returning a JSON-serializable payload
+            interval: Seconds between refreshes
+            jitter: Fraction of `interval` to randomise each sleep by
+            name: Name of the background thread
+        """
+        self.build = build
+        self.interval = interval
+        self.jitter = jitter
+        self.name = name
+        self._snapshot = None
+        self._last_error = None
+        self._failures = 0
+        self._build_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Start the background refresh thread (idempotent)"""
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        if self._snapshot is None:
+            self.refresh()
+        while True:
+            spread = self.interval * self.jitter
+            time.sleep(max(1.0, self.interval + random.uniform(-spread, spread)))
+            self.refresh()
+
+    def refresh(self):
+        """Rebuild the snapshot now; on failure keep serving the last good one"""
+        with self._build_lock:
+            try:
+                payload = self.build()
+                body = json.dumps(payload).encode()
+            except Exception as e:
+                self._failures += 1
+                self._last_error = f"{type(e).__name__}: {e}"
+                print(f"❌ {self.name} refresh failed: {self._last_error}")
+                return False
+
+            self._snapshot = Snapshot(body=body, built_at=time.time())
+            self._failures = 0
+            self._last_error = None
+            return True
+
+    def get(self):
+        """
+        Return the current snapshot, building the first one inline if needed
+
+        Returns:
+            Snapshot, or None if no build has ever succeeded
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._build_lock:
+                snapshot = self._snapshot
+            if snapshot is None:
+                self.refresh()
+                snapshot = self._snapshot
+        self.start()
+        return snapshot
+
+    def headers(self, snapshot):
+        """Staleness headers describing a snapshot"""
+        age = max(0.0, time.time() - snapshot.built_at)
+        stale = self._failures > 0 or age > self.interval * (1 + self.jitter) * 2
+        return {
+            'X-Snapshot-Age': f"{age:.1f}",
+            'X-Snapshot-Stale': 'true' if stale else 'false',
+            'Cache-Control': 'no-cache'
+        }
@@ -0,0 +1,227 @@
+"""
+Polymarket Subgraph helpers
+Batched, parameterised GraphQL queries shared by the dashboards and scripts
+"""
+
+import requests
+
+# Polymarket Subgraph endpoints
+SUBGRAPH_URL = "https://api.thegraph.com/subgraphs/name/polymarket/matic-markets-5"
+POLYMARKET_MATIC_URL = "https://api.thegraph.com/subgraphs/name/polymarket/polymarket-matic"
+
+# Addresses resolved per users(where: {id_in: ...}) query
+DEFAULT_CHUNK_SIZE = 100
+
+# Default selection set for user lookups
+USER_FIELDS = """
+    id
+    numTrades
+    totalVolume
+    numMarkets
+"""
+
+USERS_QUERY = """
+query GetUsers($ids: [String!]!, $first: Int!) {
+    users(first: $first, where: {id_in: $ids}) {
+        %s
+    }
+}
+"""
+
+# Keep-alive session reused by every subgraph request in this process
+_session = requests.Session()
+_session.headers.update({
+    'Content-Type': 'application/json',
+    'Accept': 'application/json'
+})
+
+
+class SubgraphError(Exception):
+    """Raised when the subgraph answers with GraphQL errors"""
+
+
+def query_subgraph(query, variables=None, url=SUBGRAPH_URL, timeout=10):
+    """
+    Run one GraphQL query against a subgraph
+
+    Returns:
+        The `data` object of the response
+
+    Raises:
+        requests.RequestException on transport/HTTP errors, SubgraphError on GraphQL errors
+    """
+    response = _session.post(
+        url,
+        json={'query': query, 'variables': variables or {}},
+        timeout=timeout
+    )
+    response.raise_for_status()
+
+    payload = response.json()
+    if payload.get('errors'):
+        raise SubgraphError(payload['errors'][0].get('message', 'Unknown subgraph error'))
+    return payload.get('data') or {}
+
+
+def fetch_users(addresses, fields=USER_FIELDS, url=SUBGRAPH_URL,
+                chunk_size=DEFAULT_CHUNK_SIZE, timeout=10):
+    """
+    Resolve many user entities in as few round trips as possible
+
+    Addresses are lower-cased, de-duplicated and sent in chunks of
+    `chunk_size` as a single `users(where: {id_in: $ids})` query each.
+
+    Args:
+        addresses: Iterable of wallet addresses
+        fields: GraphQL selection set for each user
+        url: Subgraph endpoint
+        chunk_size: Maximum addresses per query
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Dict of lower-cased address -> user dict, or None when the subgraph
+        has no such user. Addresses whose chunk failed are left out.
+    """
+    ids = list(dict.fromkeys(address.lower() for address in addresses))
+    query = USERS_QUERY % fields
+    results = {}
+
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        try:
+            data = query_subgraph(query, {'ids': chunk, 'first': len(chunk)}, url=url, timeout=timeout)
+        except Exception as e:
+            print(f"Subgraph error for {len(chunk)} addresses: {e}")
+            continue
+
+        found = {user['id'].lower(): user for user in data.get('users') or []}
+        for address in chunk:
+            results[address] = found.get(address)
+
+    return results
+
+
+# Default selection sets for history pagination
+TRADE_FIELDS = """
+    id
+    timestamp
+    market {
+        id
+        question
+    }
+    outcome
+    side
+    size
+    price
+    feeRate
+"""
+
+POSITION_FIELDS = """
+    id
+    market {
+        id
+        question
+    }
+    outcome
+    quantityBought
+    quantitySold
+    valueBought
+    valueSold
+"""
+
+USER_TRADES_QUERY = """
+query GetUserTrades($user: String!, $first: Int!, $since: BigInt!, $seen: [String!]!) {
+    user(id: $user) {
+        trades(first: $first, orderBy: timestamp, orderDirection: asc,
+               where: {timestamp_gte: $since, id_not_in: $seen}) {
+            %s
+        }
+    }
+}
+"""
+
+USER_POSITIONS_QUERY = """
+query GetUserPositions($user: String!, $first: Int!, $after: String!) {
+    user(id: $user) {
+        positions(first: $first, orderBy: id, orderDirection: asc, where: {id_gt: $after}) {
+            %s
+        }
+    }
+}
+"""
+
+
+def iter_trade_pages(address, since=0, exclude_ids=(), page_size=1000,
+                     fields=TRADE_FIELDS, url=SUBGRAPH_URL, timeout=10):
+    """
+    Walk a user's full trade history oldest-first, one page at a time
+
+    Pages are keyed by a (timestamp, ids-seen-at-that-timestamp) cursor, so
+    trades sharing a timestamp across a page boundary are neither skipped
+    nor repeated. Only one page is held in memory at a time.
+
+    Args:
+        address: Wallet address
+        since: Only return trades with timestamp >= since
+        exclude_ids: Trade ids at `since` that were already seen
+        page_size: Trades per request (The Graph caps this at 1000)
+
+    Yields:
+        Lists of trade dicts in ascending timestamp order
+    """
+    query = USER_TRADES_QUERY % fields
+    cursor = int(since)
+    seen = list(exclude_ids)
+
+    while True:
+        data = query_subgraph(query, {
+            'user': address.lower(),
+            'first': page_size,
+            'since': str(cursor),
+            'seen': seen
+        }, url=url, timeout=timeout)
+
+        user = data.get('user')
+        page = (user.get('trades') or []) if user else []
+        if not page:
+            return
+
+        yield page
+
+        if len(page) < page_size:
+            return
+
+        last_timestamp = int(page[-1]['timestamp'])
+        boundary = [trade['id'] for trade in page if int(trade['timestamp']) == last_timestamp]
+        seen = seen + boundary if last_timestamp == cursor else boundary
+        cursor = last_timestamp
+
+
+def iter_position_pages(address, page_size=1000, fields=POSITION_FIELDS,
+                        url=SUBGRAPH_URL, timeout=10):
+    """
+    Walk all of a user's positions, one page at a time, by id cursor
+
+    Yields:
+        Lists of position dicts in ascending id order
+    """
+    query = USER_POSITIONS_QUERY % fields
+    after = ''
+
+    while True:
+        data = query_subgraph(query, {
+            'user': address.lower(),
+            'first': page_size,
+            'after': after
+        }, url=url, timeout=timeout)
+
+        user = data.get('user')
+        page = (user.get('positions') or []) if user else []
+        if not page:
+            return
+
+        yield page
+
+        if len(page) < page_size:
+            return
+        after = page[-1]['id']
@@ -0,0 +1,91 @@
+"""
+Durable trade outbox for the dashboard integration
+Append-only SQLite queue of trades waiting to be reported, so trades survive
+API outages and bot restarts without growing memory
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Tuple
+
+DASHBOARD_OUTBOX_PATH = os.getenv('DASHBOARD_OUTBOX_PATH', 'dashboard_outbox.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class TradeOutbox:
+    """
+    At-least-once trade outbox
+
+    Every trade carries an idempotency key (its tx_hash, or a random id when
+    it has none) so the dashboard can ignore copies that are re-sent after a
+    lost acknowledgement. Entries stay on disk until ack() removes them.
+
+    The number of waiting entries is counted once on open and then kept in
+    memory, so len() never touches the database and is safe on an event loop.
+    """
+
+    def __init__(self, path: str = DASHBOARD_OUTBOX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._depth = self._conn.execute('SELECT COUNT(*) FROM outbox').fetchone()[0]
+
+    def append(self, trade: Dict) -> str:
+        """
+        Persist a trade for delivery
+
+        Returns:
+            The trade's idempotency key; appending the same key twice is a no-op
+        """
+        key = trade.get('idempotency_key') or trade.get('tx_hash') or uuid.uuid4().hex
+        trade['idempotency_key'] = key
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO outbox (idempotency_key, payload, created_at) VALUES (?, ?, ?)',
+                (key, json.dumps(trade), time.time())
+            )
+            self._depth += cursor.rowcount
+        return key
+
+    def peek(self, limit: int) -> List[Tuple[int, Dict]]:
+        """Oldest `limit` undelivered trades as (seq, trade) pairs"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT seq, payload FROM outbox ORDER BY seq LIMIT ?', (limit,)
+            ).fetchall()
+        return [(seq, json.loads(payload)) for seq, payload in rows]
+
+    def ack(self, seqs: List[int]):
+        """Remove delivered trades"""
+        with self._lock, self._conn:
+            cursor = self._conn.executemany('DELETE FROM outbox WHERE seq = ?', [(seq,) for seq in seqs])
+            self._depth -= cursor.rowcount
+
+    def oldest_age(self) -> float:
+        """Seconds the oldest undelivered trade has been waiting (0 when empty)"""
+        with self._lock:
+            row = self._conn.execute('SELECT created_at FROM outbox ORDER BY seq LIMIT 1').fetchone()
+        return time.time() - row[0] if row else 0.0
+
+    def __len__(self) -> int:
+        return self._depth
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,197 @@
+"""
+Local trade store for the wallet dashboards
+SQLite-backed history keyed by wallet and trade id, with a per-wallet
+high-water mark so each refresh only downloads trades newer than the last sync
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+TRADE_STORE_PATH = os.getenv('TRADE_STORE_PATH', 'trade_store.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    wallet TEXT NOT NULL,
+    source TEXT NOT NULL,
+    trade_id TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    market TEXT,
+    side TEXT,
+    size REAL,
+    price REAL,
+    PRIMARY KEY (wallet, source, trade_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_trades_wallet_time
+    ON trades (wallet, source, timestamp);
+
+CREATE TABLE IF NOT EXISTS positions (
+    wallet TEXT NOT NULL,
+    position_id TEXT NOT NULL,
+    value_bought REAL,
+    value_sold REAL,
+    PRIMARY KEY (wallet, position_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    wallet TEXT NOT NULL,
+    source TEXT NOT NULL,
+    last_timestamp INTEGER NOT NULL DEFAULT 0,
+    synced_at REAL,
+    PRIMARY KEY (wallet, source)
+) WITHOUT ROWID;
+"""
+
+
+class TradeStore:
+    """
+    Append-only trade history per (wallet, source)
+
+    Trades are normalised dicts with keys id, timestamp, market, side,
+    size and price. Re-inserting a known trade id is a no-op, so
+    overlapping sync windows are harmless.
+    """
+
+    def __init__(self, path=TRADE_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def high_water_mark(self, wallet, source):
+        """
+        Sync cursor for a wallet
+
+        Returns:
+            (last_timestamp, ids of the stored trades at that timestamp)
+        """
+        wallet = wallet.lower()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT last_timestamp FROM sync_state WHERE wallet = ? AND source = ?',
+                (wallet, source)
+            ).fetchone()
+            if row is None:
+                return 0, []
+            ids = [r['trade_id'] for r in self._conn.execute(
+                'SELECT trade_id FROM trades WHERE wallet = ? AND source = ? AND timestamp = ?',
+                (wallet, source, row['last_timestamp'])
+            )]
+        return row['last_timestamp'], ids
+
+    def append_trades(self, wallet, source, trades, advance=True):
+        """
+        Insert new trades and advance the wallet's high-water mark in one transaction
+
+        Args:
+            advance: False stores the trades but keeps the mark, for a sync
+                that could not fetch everything newer than it
+        """
+        wallet = wallet.lower()
+        with self._lock, self._conn:
+            self._conn.executemany('''
+                INSERT OR IGNORE INTO trades (wallet, source, trade_id, timestamp, market, side, size, price)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (wallet, source, str(t['id']), int(t['timestamp']), t.get('market'),
+                 t.get('side'), float(t.get('size', 0)), float(t.get('price', 0)))
+                for t in trades
+            ])
+            if advance:
+                self._mark_synced(wallet, source)
+
+    def mark_synced(self, wallet, source):
+        """Record a completed sync even when no new trades arrived"""
+        with self._lock, self._conn:
+            self._mark_synced(wallet.lower(), source)
+
+    def _mark_synced(self, wallet, source):
+        self._conn.execute('''
+            INSERT INTO sync_state (wallet, source, last_timestamp, synced_at)
+            VALUES (?, ?, COALESCE((SELECT MAX(timestamp) FROM trades WHERE wallet = ? AND source = ?), 0), ?)
+            ON CONFLICT(wallet, source) DO UPDATE SET
+                last_timestamp = excluded.last_timestamp,
+                synced_at = excluded.synced_at
+        ''', (wallet, source, wallet, source, time.time()))
+
+    def upsert_positions(self, wallet, positions):
+        """Store the latest value bought/sold for each position"""
+        wallet = wallet.lower()
+        with self._lock, self._conn:
+            self._conn.executemany('''
+                INSERT OR REPLACE INTO positions (wallet, position_id, value_bought, value_sold)
+                VALUES (?, ?, ?, ?)
+            ''', [
+                (wallet, str(p['id']), float(p.get('value_bought', 0)), float(p.get('value_sold', 0)))
+                for p in positions
+            ])
+
+    def iter_trades(self, wallet, source, batch_size=5000):
+        """Yield stored trades oldest-first without loading them all at once"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute('''
+                SELECT trade_id AS id, timestamp, market, side, size, price
+                FROM trades
+                WHERE wallet = ? AND source = ?
+                ORDER BY timestamp, trade_id
+            ''', (wallet.lower(), source))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield dict(row)
+        finally:
+            conn.close()
+
+    def iter_rows(self, wallet, source):
+        """
+        Yield (timestamp, is_buy, size, price) tuples for columnar loading
+
+        Plain tuples come straight off the cursor, so callers can feed
+        them to np.fromiter without building per-trade dicts.
+        """
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            yield from conn.execute('''
+                SELECT timestamp, side = 'BUY', size, price
+                FROM trades
+                WHERE wallet = ? AND source = ?
+            ''', (wallet.lower(), source))
+        finally:
+            conn.close()
+
+    def recent_trades(self, wallet, source, limit):
+        """Most recent `limit` trades, newest first"""
+        with self._lock:
+            rows = self._conn.execute('''
+                SELECT trade_id AS id, timestamp, market, side, size, price
+                FROM trades
+                WHERE wallet = ? AND source = ?
+                ORDER BY timestamp DESC, trade_id DESC
+                LIMIT ?
+            ''', (wallet.lower(), source, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def positions_pnl(self, wallet):
+        """Realised P&L across all stored positions of a wallet"""
+        with self._lock:
+            row = self._conn.execute('''
+                SELECT COALESCE(SUM(value_sold - value_bought), 0) AS pnl
+                FROM positions WHERE wallet = ?
+            ''', (wallet.lower(),)).fetchone()
+        return row['pnl']
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,115 @@
+"""
+Vectorized wallet history analytics
+Columnar NumPy aggregation of volume, buy/sell value, win rate and daily buckets
+"""
+
+from collections import namedtuple
+from datetime import datetime, timezone
+
+import numpy as np
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+
+# Structured dtype of one trade row, as loaded from the trade store
+TRADE_DTYPE = np.dtype([
+    ('timestamp', np.int64),
+    ('is_buy', np.bool_),
+    ('size', np.float64),
+    ('price', np.float64)
+])
+
+# Column views over a structured trade array
+TradeColumns = namedtuple('TradeColumns', ['timestamp', 'is_buy', 'size', 'price'])
+
+
+def to_columns(trades):
+    """
+    Build columns from an iterable of (timestamp, is_buy, size, price) tuples
+
+    Uses np.fromiter so no intermediate Python list is materialised.
+    """
+    rows = np.fromiter(trades, dtype=TRADE_DTYPE)
+    return TradeColumns(rows['timestamp'], rows['is_buy'], rows['size'], rows['price'])
+
+
+def local_utc_offsets(timestamps):
+    """
+    Local UTC offset in seconds at each timestamp (used for daily bucketing)
+
+    Offsets only change on DST transitions, which start on the hour, so
+    each distinct hour is resolved once through the local timezone and
+    mapped back onto the trades.
+    """
+    hours, inverse = np.unique(timestamps // SECONDS_PER_HOUR, return_inverse=True)
+    offsets = np.fromiter(
+        (datetime.fromtimestamp(int(h) * SECONDS_PER_HOUR).astimezone().utcoffset().total_seconds()
+         for h in hours),
+        dtype=np.int64, count=hours.shape[0]
+    )
+    return offsets[inverse.reshape(-1)]
+
+
+def summarize(columns, utc_offset=None, chart_days=30):
+    """
+    Compute the wallet history summary and chart series in vectorized passes
+
+    Args:
+        columns: TradeColumns
+        utc_offset: Seconds added to timestamps before bucketing by day;
+            defaults to the server's local offset at each trade
+        chart_days: Number of most recent trading days in the chart
+
+    Returns:
+        (summary, charts) where summary has total_volume, buy_value,
+        sell_value, total_trades, win_rate and charts has dates/volume/pnl
+    """
+    total_trades = int(columns.timestamp.shape[0])
+    if total_trades == 0:
+        return {
+            'total_volume': 0,
+            'buy_value': 0,
+            'sell_value': 0,
+            'total_trades': 0,
+            'win_rate': 0
+        }, {'dates': [], 'volume': [], 'pnl': []}
+
+    value = columns.size * columns.price
+    is_sell = ~columns.is_buy
+
+    total_volume = float(value.sum())
+    sell_value = float(value[is_sell].sum())
+    buy_value = total_volume - sell_value
+
+    total_closed = int(np.count_nonzero(is_sell))
+    wins = int(np.count_nonzero(is_sell & (value > 0)))
+    win_rate = (wins / total_closed * 100) if total_closed > 0 else 0
+
+    # Daily buckets: one bincount over day indexes instead of a strftime per trade
+    if utc_offset is None:
+        utc_offset = local_utc_offsets(columns.timestamp)
+    days = (columns.timestamp + utc_offset) // SECONDS_PER_DAY
+    first_day = int(days.min())
+    offsets = days - first_day
+    daily_volume = np.bincount(offsets, weights=value)
+    traded_days = np.flatnonzero(np.bincount(offsets))[-chart_days:]
+
+    dates = [
+        datetime.fromtimestamp((first_day + int(d)) * SECONDS_PER_DAY, tz=timezone.utc).strftime('%Y-%m-%d')
+        for d in traded_days
+    ]
+
+    summary = {
+        'total_volume': total_volume,
+        'buy_value': buy_value,
+        'sell_value': sell_value,
+        'total_trades': total_trades,
+        'win_rate': round(win_rate, 1)
+    }
+    charts = {
+        'dates': dates,
+        'volume': daily_volume[traded_days].tolist(),
+        # Per-trade P&L is not tracked yet, so the cumulative series stays flat
+        'pnl': [0] * len(dates)
+    }
+    return summary, charts
@@ -0,0 +1,283 @@
+"""
+Per-address cache for wallet stats shared by the Flask dashboards
+TTL + stale-while-revalidate, LRU bound, and single-flight fetches per address
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+DEFAULT_TTL = float(os.getenv('WALLET_CACHE_TTL', 30))
+DEFAULT_STALE_TTL = float(os.getenv('WALLET_CACHE_STALE_TTL', 300))
+DEFAULT_MAX_ENTRIES = int(os.getenv('WALLET_CACHE_MAX_ENTRIES', 256))
+
+
+def _make_key(args):
+    """Addresses are case-insensitive, so normalise them before keying"""
+    return tuple(a.lower() if isinstance(a, str) else a for a in args)
+
+
+class WalletStatsCache:
+    """
+    Cache in front of a wallet stats fetcher
+
+    - Fresh entries (younger than `ttl`) are served directly.
+    - Stale entries (up to `ttl + stale_ttl` old) are served immediately
+      while a single background refresh brings them up to date.
+    - Missing or expired entries are fetched inline; concurrent callers
+      for the same address wait on that one in-flight fetch.
+    """
+
+    def __init__(self, fetch, ttl=DEFAULT_TTL, stale_ttl=DEFAULT_STALE_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES, cacheable=None, refresh_workers=4,
+                 fetch_many=None):
+        """
+        Args:
+            fetch: Function returning stats for the given address argument(s)
+            ttl: Seconds an entry is considered fresh
+            stale_ttl: Extra seconds a stale entry may be served while refreshing
+            max_entries: LRU bound on the number of cached addresses
+            cacheable: Optional predicate; results it rejects are returned but not stored
+            refresh_workers: Threads used for background revalidation
+            fetch_many: Optional batch fetcher taking a list of argument tuples and
+                returning results in the same order; used by get_many()
+        """
+        self.fetch = fetch
+        self.fetch_many = fetch_many
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.cacheable = cacheable
+        self._entries = OrderedDict()  # key -> (value, fetched_at)
+        self._inflight = {}  # key -> Future
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers,
+                                             thread_name_prefix='wallet-cache')
+        self._metrics = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'collapsed': 0,
+            'refreshes': 0,
+            'refresh_errors': 0,
+            'evictions': 0
+        }
+
+    def get(self, *args):
+        """Return stats for the address argument(s), fetching only when needed"""
+        key = _make_key(args)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, fetched_at = entry
+                age = now - fetched_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._metrics['hits'] += 1
+                    return copy.copy(value)
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._metrics['stale_hits'] += 1
+                    if key not in self._inflight:
+                        future = Future()
+                        self._inflight[key] = future
+                        self._refresher.submit(self._refresh, key, args, future)
+                    return copy.copy(value)
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self._metrics['collapsed'] += 1
+                owner = False
+            else:
+                self._metrics['misses'] += 1
+                future = Future()
+                self._inflight[key] = future
+                owner = True
+
+        if owner:
+            self._load(key, args, future)
+        return copy.copy(future.result())
+
+    def get_many(self, args_list):
+        """
+        Batched get(): every miss is resolved by a single fetch_many() call
+
+        Args:
+            args_list: List of argument tuples, one per wallet
+
+        Returns:
+            List of stats in the same order as `args_list`
+        """
+        if self.fetch_many is None:
+            return [self.get(*args) for args in args_list]
+
+        now = time.monotonic()
+        results = [None] * len(args_list)
+        waiting = []  # (index, future)
+        owned = []  # (key, args, future) fetched inline by this call
+        stale = []  # (key, args, future) revalidated in the background
+
+        with self._lock:
+            for index, args in enumerate(args_list):
+                key = _make_key(args)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    value, fetched_at = entry
+                    age = now - fetched_at
+                    if age < self.ttl + self.stale_ttl:
+                        self._entries.move_to_end(key)
+                        results[index] = copy.copy(value)
+                        if age < self.ttl:
+                            self._metrics['hits'] += 1
+                            continue
+                        self._metrics['stale_hits'] += 1
+                        if key not in self._inflight:
+                            future = Future()
+                            self._inflight[key] = future
+                            stale.append((key, args, future))
+                        continue
+
+                future = self._inflight.get(key)
+                if future is not None:
+                    self._metrics['collapsed'] += 1
+                else:
+                    self._metrics['misses'] += 1
+                    future = Future()
+                    self._inflight[key] = future
+                    owned.append((key, args, future))
+                waiting.append((index, future))
+
+        if stale:
+            self._refresher.submit(self._refresh_many, stale)
+        if owned:
+            self._load_many(owned)
+
+        for index, future in waiting:
+            results[index] = copy.copy(future.result())
+        return results
+
+    def _load_many(self, batch):
+        """Run one fetch_many() for a batch and publish each result"""
+        try:
+            values = self.fetch_many([args for _, args, _ in batch])
+        except BaseException as e:
+            with self._lock:
+                for key, _, _ in batch:
+                    self._inflight.pop(key, None)
+            for _, _, future in batch:
+                future.set_exception(e)
+            return False
+
+        with self._lock:
+            for (key, _, _), value in zip(batch, values):
+                self._inflight.pop(key, None)
+                if self.cacheable is None or self.cacheable(value):
+                    self._store(key, value)
+        for (_, _, future), value in zip(batch, values):
+            future.set_result(value)
+        return True
+
+    def _refresh_many(self, batch):
+        """Background revalidation of several stale entries in one batch"""
+        with self._lock:
+            self._metrics['refreshes'] += len(batch)
+        if not self._load_many(batch):
+            with self._lock:
+                self._metrics['refresh_errors'] += len(batch)
+
+    def refresh(self, *args):
+        """
+        Fetch fresh stats for the address argument(s), bypassing the TTL
+
+        Joins an in-flight fetch for the same address if there is one. When
+        the new result is not cacheable, the last good entry (if any) is
+        returned instead, so periodic refreshers keep serving known data
+        through upstream errors.
+        """
+        key = _make_key(args)
+        with self._lock:
+            self._metrics['refreshes'] += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if owner:
+            self._load(key, args, future)
+
+        try:
+            value = future.result()
+        except Exception:
+            with self._lock:
+                self._metrics['refresh_errors'] += 1
+                entry = self._entries.get(key)
+            if entry is None:
+                raise
+            return copy.copy(entry[0])
+
+        if self.cacheable is not None and not self.cacheable(value):
+            with self._lock:
+                self._metrics['refresh_errors'] += 1
+                entry = self._entries.get(key)
+            if entry is not None:
+                return copy.copy(entry[0])
+        return copy.copy(value)
+
+    def _load(self, key, args, future):
+        """Run the fetch and publish its result to every waiter"""
+        try:
+            value = self.fetch(*args)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            return False
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            if self.cacheable is None or self.cacheable(value):
+                self._store(key, value)
+        future.set_result(value)
+        return True
+
+    def _refresh(self, key, args, future):
+        """Background revalidation of a stale entry"""
+        with self._lock:
+            self._metrics['refreshes'] += 1
+        if not self._load(key, args, future):
+            with self._lock:
+                self._metrics['refresh_errors'] += 1
+
+    def _store(self, key, value):
+        """Insert an entry and enforce the LRU bound (caller holds the lock)"""
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._metrics['evictions'] += 1
+
+    def invalidate(self, *args):
+        """Drop the entry for one address"""
+        with self._lock:
+            self._entries.pop(_make_key(args), None)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self):
+        """Hit/miss/refresh counters plus current size"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['size'] = len(self._entries)
+            metrics['inflight'] = len(self._inflight)
+        lookups = metrics['hits'] + metrics['stale_hits'] + metrics['misses'] + metrics['collapsed']
+        metrics['hit_ratio'] = (metrics['hits'] + metrics['stale_hits']) / lookups if lookups else 0
+        return metrics
@@ -5,11 +5,13 @@ Fetches complete trading history from Polymarket Subgraph
 """
 
 import json
-import requests
 from datetime import datetime, timedelta
 from decimal import Decimal
 from flask import Flask, render_template_string, jsonify
 from flask_cors import CORS
+from subgraph import SUBGRAPH_URL, fetch_users, iter_trade_pages, iter_position_pages
+from trade_store import TradeStore
+from wallet_analytics import to_columns, summarize
 
 app = Flask(__name__)
 CORS(app)
@@ -17,8 +19,11 @@ CORS(app)
 # Main wallet address from leaderboard
 MAIN_WALLET = "0x707a2F7b8884E45bF5AA26f0dC44aA3aE309D4ff"
 
-# Polymarket Subgraph endpoint
-SUBGRAPH_URL = "https://api.thegraph.com/subgraphs/name/polymarket/matic-markets-5"
+# Most recent trades returned to the trades table
+RECENT_TRADES_LIMIT = 1000
+
+# Local trade history, synced incrementally from the subgraph
+TRADE_STORE = TradeStore()
 
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
@@ -252,142 +257,82 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
-def fetch_wallet_history(address):
-    """Fetch complete trading history from Polymarket Subgraph"""
-
-    # GraphQL query for all trades
-    query = """
-    query GetWalletHistory($user: String!) {
-        user(id: $user) {
-            id
-            numTrades
-            numMarkets
-            totalVolume
-            trades(first: 1000, orderBy: timestamp, orderDirection: desc) {
-                id
-                timestamp
-                market {
-                    id
-                    question
-                }
-                outcome
-                side
-                size
-                price
-                feeRate
-            }
-            positions(first: 100) {
-                id
-                market {
-                    id
-                    question
-                }
-                outcome
-                quantityBought
-                quantitySold
-                valueBought
-                valueSold
-            }
-        }
+def normalize_trade(trade):
+    """Flatten a raw subgraph trade into the trade store format"""
+    return {
+        'id': trade['id'],
+        'timestamp': int(trade['timestamp']),
+        'market': trade['market']['question'] if trade.get('market') else None,
+        'side': trade['side'],
+        'size': float(trade['size']) / 1e6,  # Convert from wei
+        'price': float(trade['price'])
     }
-    """
 
-    try:
-        response = requests.post(
-            SUBGRAPH_URL,
-            json={
-                'query': query,
-                'variables': {'user': address.lower()}
-            },
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
-
-        if response.status_code == 200:
-            data = response.json()
-
-            if 'data' in data and data['data'] and 'user' in data['data']:
-                user = data['data']['user']
-
-                # Process trades
-                trades = []
-                total_volume = 0
-                total_pnl = 0
-                buy_value = 0
-                sell_value = 0
-
-                if user and 'trades' in user:
-                    for trade in user['trades']:
-                        size = float(trade['size']) / 1e6  # Convert from wei
-                        price = float(trade['price'])
-                        value = size * price
-
-                        trade_data = {
-                            'timestamp': int(trade['timestamp']),
-                            'market': trade['market']['question'] if 'market' in trade else 'Unknown',
-                            'side': trade['side'],
-                            'size': size,
-                            'price': price,
-                            'value': value,
-                            'pnl': 0  # Will calculate based on positions
-                        }
 
-                        if trade['side'] == 'BUY':
-                            buy_value += value
-                        else:
-                            sell_value += value
-
-                        trades.append(trade_data)
-                        total_volume += value
-
-                # Calculate P&L from positions
-                positions_pnl = 0
-                if user and 'positions' in user:
-                    for position in user['positions']:
-                        bought = float(position.get('valueBought', 0)) / 1e6
-                        sold = float(position.get('valueSold', 0)) / 1e6
-                        positions_pnl += (sold - bought)
-
-                total_pnl = positions_pnl
-
-                # Calculate win rate
-                wins = sum(1 for t in trades if t['side'] == 'SELL' and t['value'] > 0)
-                total_closed = sum(1 for t in trades if t['side'] == 'SELL')
-                win_rate = (wins / total_closed * 100) if total_closed > 0 else 0
-
-                # Prepare chart data (daily aggregation)
-                daily_data = {}
-                for trade in trades:
-                    date = datetime.fromtimestamp(trade['timestamp']).strftime('%Y-%m-%d')
-                    if date not in daily_data:
-                        daily_data[date] = {'volume': 0, 'pnl': 0}
-                    daily_data[date]['volume'] += trade['value']
-
-                # Sort dates and create chart arrays
-                sorted_dates = sorted(daily_data.keys())
-                cumulative_pnl = 0
-                chart_data = {
-                    'dates': sorted_dates[-30:],  # Last 30 days
-                    'volume': [daily_data[d]['volume'] for d in sorted_dates[-30:]],
-                    'pnl': []
-                }
+def normalize_position(position):
+    """Flatten a raw subgraph position into the trade store format"""
+    return {
+        'id': position['id'],
+        'value_bought': float(position.get('valueBought', 0)) / 1e6,
+        'value_sold': float(position.get('valueSold', 0)) / 1e6
+    }
 
-                # Calculate cumulative P&L
-                for date in sorted_dates[-30:]:
-                    cumulative_pnl += daily_data[date]['pnl']
-                    chart_data['pnl'].append(cumulative_pnl)
-
-                return {
-                    'summary': {
-                        'total_volume': total_volume,
-                        'total_pnl': total_pnl,
-                        'win_rate': round(win_rate, 1),
-                        'total_trades': len(trades),
-                        'active_markets': user.get('numMarkets', 0) if user else 0
-                    },
-                    'trades': trades,
-                    'charts': chart_data
-                }
+
+def sync_wallet_history(address):
+    """Pull only trades newer than the wallet's high-water mark into the local store"""
+    since, seen_ids = TRADE_STORE.high_water_mark(address, 'subgraph')
+
+    for page in iter_trade_pages(address, since=since, exclude_ids=seen_ids, url=SUBGRAPH_URL):
+        TRADE_STORE.append_trades(address, 'subgraph', [normalize_trade(t) for t in page])
+    TRADE_STORE.mark_synced(address, 'subgraph')
+
+    # Positions are mutable aggregates, so refresh them in place
+    for page in iter_position_pages(address, url=SUBGRAPH_URL):
+        TRADE_STORE.upsert_positions(address, [normalize_position(p) for p in page])
+
+
+def fetch_wallet_history(address):
+    """Sync a wallet's trading history and build the dashboard payload from the local store"""
+
+    try:
+        active_markets = 0
+        try:
+            users = fetch_users([address], fields="id numMarkets", url=SUBGRAPH_URL)
+            user = users.get(address.lower())
+            if user:
+                active_markets = user.get('numMarkets', 0)
+                sync_wallet_history(address)
+        except Exception as e:
+            # Upstream is unavailable: serve whatever history is already stored
+            print(f"Error syncing wallet history: {e}")
+
+        # Vectorized aggregation over the stored history
+        columns = to_columns(TRADE_STORE.iter_rows(address, 'subgraph'))
+        summary, charts = summarize(columns)
+
+        trades = []
+        for trade in TRADE_STORE.recent_trades(address, 'subgraph', RECENT_TRADES_LIMIT):
+            trades.append({
+                'timestamp': trade['timestamp'],
+                'market': trade['market'] or 'Unknown',
+                'side': trade['side'],
+                'size': trade['size'],
+                'price': trade['price'],
+                'value': trade['size'] * trade['price'],
+                'pnl': 0  # Will calculate based on positions
+            })
+
+        return {
+            'summary': {
+                'total_volume': summary['total_volume'],
+                'total_pnl': TRADE_STORE.positions_pnl(address),
+                'win_rate': summary['win_rate'],
+                'total_trades': summary['total_trades'],
+                'active_markets': active_markets
+            },
+            'trades': trades,
+            'charts': charts
+        }
 
     except Exception as e:
         print(f"Error fetching wallet history: {e}")